@@ -8,11 +8,14 @@ ReAct-style loop: user question -> LLM generates SQL -> execute read-only
 import json
 import os
 import re
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
 import requests as http_requests
+from requests.adapters import HTTPAdapter, Retry
 
 import database
 import ontology
+import semantic_cache
 
 # Stanford AI API Gateway (same config as ontology.py)
 LLM_API_URL = "https://aiapi-prod.stanford.edu/v1/chat/completions"
@@ -21,6 +24,20 @@ LLM_MODEL = "gemini-2.5-pro"
 MAX_TOOL_ROUNDS = 3
 RESULT_TRUNCATION_BYTES = 8192
 
+# Compiled once at import — avoids the per-call pattern cache lookup on the
+# hot agent-turn path. New regexes in this module should follow this pattern.
+_SQL_BLOCK_RE = re.compile(r"```sql\s*\n(.*?)```", re.DOTALL)
+
+# Persistent session to the LLM gateway: keeps the TCP+TLS connection alive
+# across the up-to-3 calls per turn (and across turns), with a bounded retry
+# for transient gateway errors.
+_LLM_SESSION = http_requests.Session()
+_LLM_SESSION.mount("https://", HTTPAdapter(
+    pool_connections=4,
+    pool_maxsize=16,
+    max_retries=Retry(total=2, backoff_factor=0.2, status_forcelist=[502, 503, 504]),
+))
+
 SYSTEM_PROMPT = """\
 You are **nano ISAAC**, a helpful AI assistant for querying the ISAAC \
 AI-Ready Record database. You answer researchers' questions about the \
@@ -109,7 +126,25 @@ code block. The system will execute it and show you the results.
 
 def _extract_sql_blocks(text: str) -> list[str]:
     """Extract all ```sql ... ``` fenced code blocks from LLM output."""
-    return re.findall(r"```sql\s*\n(.*?)```", text, re.DOTALL)
+    return _SQL_BLOCK_RE.findall(text)
+
+
+def _apply_prompt_cache_hint(messages: list[dict]) -> list[dict]:
+    """
+    Mark the system message for provider-side prompt caching.
+
+    The system prompt is a large byte-stable prefix (schema + vocabulary +
+    rules); providers that support prefix caching can process it once and
+    reuse it on every subsequent call. Gated by ISAAC_PROMPT_CACHE=1 because
+    the Stanford gateway may proxy to backends that reject the extra field.
+    """
+    if os.environ.get("ISAAC_PROMPT_CACHE", "0") != "1":
+        return messages
+    if not messages or messages[0].get("role") != "system":
+        return messages
+    system_msg = dict(messages[0])
+    system_msg["cache_control"] = {"type": "ephemeral"}
+    return [system_msg] + messages[1:]
 
 
 def _call_llm(messages: list[dict]) -> str:
@@ -129,7 +164,7 @@ def _call_llm(messages: list[dict]) -> str:
     if not api_key:
         raise RuntimeError("ISAAC_LLM_API_KEY not configured")
 
-    resp = http_requests.post(
+    resp = _LLM_SESSION.post(
         LLM_API_URL,
         headers={
             "Authorization": f"Bearer {api_key}",
@@ -139,7 +174,7 @@ def _call_llm(messages: list[dict]) -> str:
             "model": LLM_MODEL,
             "stream": False,
             "temperature": 0.2,
-            "messages": messages,
+            "messages": _apply_prompt_cache_hint(messages),
         },
         timeout=60,
     )
@@ -151,28 +186,63 @@ def _call_llm(messages: list[dict]) -> str:
     return data["choices"][0]["message"]["content"]
 
 
+_MAX_SQL_WORKERS = 4
+
+
+def _execute_sql_blocks(sqls: list[str]) -> list:
+    """
+    Execute the SQL blocks from one agent turn.
+
+    A single block goes through the shared-connection batch path. Multiple
+    blocks are independent read-only SELECTs, so they run concurrently on a
+    small thread pool — turn wall time becomes max(t_i) instead of sum(t_i).
+
+    Returns one entry per block, in order: a list of row dicts or the
+    Exception raised for that block.
+    """
+    if len(sqls) <= 1:
+        return database.execute_readonly_queries(sqls)
+
+    results: list = [None] * len(sqls)
+    with ThreadPoolExecutor(max_workers=min(_MAX_SQL_WORKERS, len(sqls))) as pool:
+        futures = {
+            pool.submit(database.execute_readonly_query, sql): i
+            for i, sql in enumerate(sqls)
+        }
+        for fut in as_completed(futures):
+            i = futures[fut]
+            try:
+                results[i] = fut.result()
+            except Exception as exc:
+                results[i] = exc
+    return results
+
+
 def _format_query_results(rows: list[dict], sql: str) -> str:
     """
     Format query results into a text block for the LLM, truncated at 8 KB.
     """
-    header = f"Query:\n{sql}\n\nResults ({len(rows)} row{'s' if len(rows) != 1 else ''}):\n"
+    n = len(rows)
+    plural = "" if n == 1 else "s"
+    header = f"Query:\n{sql}\n\nResults ({n} row{plural}):\n"
     if not rows:
         return header + "(no rows returned)"
 
-    # Convert to JSON lines, respecting the truncation budget
+    # Convert to compact JSON lines, respecting the truncation budget in
+    # UTF-8 bytes (the unit RESULT_TRUNCATION_BYTES is defined in)
     lines = [header]
-    budget = RESULT_TRUNCATION_BYTES - len(header)
+    budget = RESULT_TRUNCATION_BYTES - len(header.encode('utf-8'))
     for i, row in enumerate(rows):
-        # Serialize datetimes
-        for k, v in row.items():
-            if hasattr(v, 'isoformat'):
-                row[k] = v.isoformat()
-        line = json.dumps(row, default=str)
-        if budget - len(line) < 0:
-            lines.append(f"... truncated ({len(rows) - i} more rows)")
+        # Serialize datetimes into a fresh dict — don't mutate caller's rows
+        cleaned = {k: (v.isoformat() if hasattr(v, 'isoformat') else v)
+                   for k, v in row.items()}
+        line = json.dumps(cleaned, default=str, separators=(",", ":"))
+        line_bytes = len(line.encode('utf-8')) + 1  # +1 for newline
+        if line_bytes > budget:
+            lines.append(f"... truncated ({n - i} more rows)")
             break
         lines.append(line)
-        budget -= len(line) + 1  # +1 for newline
+        budget -= line_bytes
 
     return "\n".join(lines)
 
@@ -203,7 +273,13 @@ def _build_vocabulary_block() -> str:
 
 
 def build_initial_messages() -> list[dict]:
-    """Create the initial conversation with the system prompt + live vocabulary."""
+    """
+    Create the initial conversation with the system prompt + live vocabulary.
+
+    The system prompt must stay byte-identical across calls within a session
+    (no timestamps, stable key order) so provider-side prompt caching can
+    reuse the processed prefix.
+    """
     vocab_block = _build_vocabulary_block()
     prompt = SYSTEM_PROMPT.replace("{vocabulary_block}", vocab_block)
     return [{"role": "system", "content": prompt}]
@@ -223,30 +299,52 @@ def run_agent_turn(conversation_history: list[dict]) -> tuple[str, list[dict]]:
     """
     messages = list(conversation_history)
 
+    # Semantic cache: a question close enough to a recently answered one
+    # skips the whole LLM + SQL loop (gated by ISAAC_SEMANTIC_CACHE=1)
+    question = next(
+        (m["content"] for m in reversed(messages) if m["role"] == "user"), None
+    )
+    if question:
+        cached_answer = semantic_cache.lookup(question)
+        if cached_answer is not None:
+            messages.append({"role": "assistant", "content": cached_answer})
+            return cached_answer, messages
+
+    last_had_sql = False
     for _round in range(MAX_TOOL_ROUNDS):
         assistant_text = _call_llm(messages)
         messages.append({"role": "assistant", "content": assistant_text})
 
         sql_blocks = _extract_sql_blocks(assistant_text)
+        last_had_sql = bool(sql_blocks)
         if not sql_blocks:
             # No SQL to execute — the LLM is done
+            if question:
+                semantic_cache.store(question, assistant_text)
             return assistant_text, messages
 
-        # Execute each SQL block and feed results back
+        # Execute the SQL blocks (concurrently if several) and feed results back
         tool_results = []
-        for sql in sql_blocks:
-            try:
-                rows = database.execute_readonly_query(sql.strip())
-                result_text = _format_query_results(rows, sql.strip())
-            except (ValueError, Exception) as exc:
-                result_text = f"Query error:\n{sql}\n\nError: {exc}"
+        stripped_blocks = [sql.strip() for sql in sql_blocks]
+        batch = _execute_sql_blocks(stripped_blocks)
+        for sql_stripped, outcome in zip(stripped_blocks, batch):
+            if isinstance(outcome, Exception):
+                result_text = f"Query error:\n{sql_stripped}\n\nError: {outcome}"
+            else:
+                result_text = _format_query_results(outcome, sql_stripped)
             tool_results.append(result_text)
 
         # Feed results back as a user message (tool-result pattern)
         feedback = "\n\n---\n\n".join(tool_results)
         messages.append({"role": "user", "content": feedback})
 
-    # If we exhausted rounds, do one final LLM call to summarise
-    assistant_text = _call_llm(messages)
-    messages.append({"role": "assistant", "content": assistant_text})
+    # If we exhausted rounds, we only owe the user one more LLM call when the
+    # last assistant message issued SQL (its results haven't been summarised).
+    # Otherwise the last assistant text already answers the user — skip the
+    # extra call.
+    if last_had_sql:
+        assistant_text = _call_llm(messages)
+        messages.append({"role": "assistant", "content": assistant_text})
+    if question:
+        semantic_cache.store(question, assistant_text)
     return assistant_text, messages
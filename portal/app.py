@@ -1,6 +1,7 @@
 import streamlit as st
 import pandas as pd
 import json
+import orjson
 import requests
 import ontology
 import database
@@ -8,11 +9,21 @@ import branding
 import agent
 import os
 import re
+import functools
 import importlib
+import threading
+import time
+import concurrent.futures
 import streamlit.components.v1 as components
 from datetime import datetime, timezone
+from itertools import chain
 
-importlib.reload(ontology)
+# Dev-only: force-reload ontology.py on script rerun. The unconditional
+# reload re-executed the whole module (and threw away its module-level
+# caches) on every Streamlit rerun; wiki updates are picked up by
+# sync_from_wiki, not by reimporting the code.
+if os.environ.get("ISAAC_DEV_RELOAD"):
+    importlib.reload(ontology)
 
 # Page Config — hide the default sidebar entirely
 st.set_page_config(page_title="ISAAC Portal", layout="wide", initial_sidebar_state="collapsed")
@@ -53,7 +64,35 @@ if "access_logged" not in st.session_state:
         except Exception:
             pass
 
-# Auto-sync from wiki on every page load if cache is stale (>5 min)
+# Auto-sync from wiki if cache is stale (>5 min). The sync (git pull +
+# parse) runs in a background daemon thread so it never blocks first
+# paint; the admin "Sync from Wiki" button stays synchronous since the
+# user explicitly asked for it.
+@st.cache_resource(show_spinner=False)
+def _wiki_sync_lock():
+    """Process-wide lock so at most one background wiki sync runs at a time."""
+    return threading.Lock()
+
+@st.cache_resource(show_spinner=False)
+def _llm_executor():
+    """Shared worker pool for LLM calls so generation never blocks a rerun."""
+    return concurrent.futures.ThreadPoolExecutor(max_workers=4)
+
+def _maybe_sync_wiki_in_background():
+    lock = _wiki_sync_lock()
+    if not lock.acquire(blocking=False):
+        return  # a sync is already running
+
+    def _do_sync():
+        try:
+            ontology.sync_from_wiki(synced_by="auto")
+        except Exception:
+            pass
+        finally:
+            lock.release()
+
+    threading.Thread(target=_do_sync, daemon=True).start()
+
 if db_connected and os.environ.get("WIKI_REPO_URL"):
     try:
         last_sync = database.get_last_sync()
@@ -63,7 +102,7 @@ if db_connected and os.environ.get("WIKI_REPO_URL"):
             if age.total_seconds() < 300:
                 need_sync = False
         if need_sync:
-            ontology.sync_from_wiki(synced_by="auto")
+            _maybe_sync_wiki_in_background()
     except Exception:
         pass
 
@@ -71,10 +110,19 @@ if db_connected and os.environ.get("WIKI_REPO_URL"):
 if "current_page" not in st.session_state:
     st.session_state.current_page = "Dashboard"
 
-PAGES = ["Dashboard", "Ontology Editor", "Record Form", "Record Validator", "Saved Records", "nano ISAAC", "API Keys", "API Documentation", "About"]
-if user_is_admin:
-    # Insert Admin Review after Ontology Editor
-    PAGES.insert(2, "Admin Review")
+# Build the page list once per session (admin status doesn't change mid-session)
+if "pages" not in st.session_state:
+    pages = ["Dashboard", "Ontology Editor", "Record Form", "Record Validator", "Saved Records", "nano ISAAC", "API Keys", "API Documentation", "About"]
+    if user_is_admin:
+        # Insert Admin Review after Ontology Editor
+        pages.insert(2, "Admin Review")
+    st.session_state.pages = pages
+PAGES = st.session_state.pages
+
+@st.cache_data(ttl=30, show_spinner=False)
+def get_pending_count():
+    """Pending-proposal count for the nav badge — don't hit the DB per rerun."""
+    return database.count_pending_proposals()
 
 # --- Top navigation bar: hamburger menu + DB status + user info ---
 nav_col, status_col, user_col = st.columns([6, 1, 2])
@@ -85,7 +133,7 @@ with nav_col:
             # Show pending count badge for Admin Review
             if p == "Admin Review" and db_connected:
                 try:
-                    pending = database.count_pending_proposals()
+                    pending = get_pending_count()
                     if pending > 0:
                         label = f"{p} ({pending})"
                 except Exception:
@@ -119,6 +167,7 @@ DISPLAY_MAP = {
     "Descriptors": "8. Descriptors"
 }
 
+@functools.lru_cache(maxsize=64)
 def get_display_name(key):
     return DISPLAY_MAP.get(key, key)
 
@@ -136,17 +185,139 @@ WIKI_MAP = {
     "Descriptors": "Descriptors"
 }
 
-# --- HELPER: Mermaid HTML Generator ---
-def render_mermaid(code, height=600):
+# Shape of the API-key identifiers this page mints: slugified username
+# plus a lowercase ULID. Anything else is rejected before an Authentik
+# round trip is scheduled (and before the string reaches a URL path).
+_API_KEY_IDENT_RE = re.compile(r"isaac-api-[a-z0-9-]+-[0-9a-hjkmnp-tv-z]{26}")
+
+# --- HELPER: Authentik session (API Keys page) ---
+@st.cache_resource(show_spinner=False)
+def get_authentik_session(api_token):
     """
-    Renders Mermaid diagram using custom HTML to support Click Events.
-    We need 'securityLevel': 'loose' for clicks to work.
+    Keep-alive requests.Session for Authentik API-key management calls.
+
+    Cached across reruns via st.cache_resource so repeat calls reuse the
+    pooled TCP connection instead of paying a fresh handshake each time.
+    The admin Authorization header is set once on the session.
+    """
+    from requests.adapters import HTTPAdapter, Retry
+    session = requests.Session()
+    session.headers["Authorization"] = f"Bearer {api_token}"
+    adapter = HTTPAdapter(
+        pool_connections=10,
+        pool_maxsize=50,
+        max_retries=Retry(total=2, backoff_factor=0.2, status_forcelist=[502, 503, 504]),
+    )
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+@st.cache_data(ttl=300, show_spinner=False)
+def lookup_authentik_user_pk(api_token, api_url, username):
+    """
+    Resolve a username to its Authentik user PK.
+
+    The mapping is effectively immutable, so cache it for 5 minutes:
+    repeat visits to the API Keys page skip the HTTPS round trip.
+    Returns None if the user is unknown to Authentik.
+    """
+    resp = get_authentik_session(api_token).get(
+        f"{api_url}/api/v3/core/users/",
+        params={"username": username},
+        timeout=5,
+    )
+    resp.raise_for_status()
+    results = resp.json().get("results", [])
+    return results[0]["pk"] if results else None
+
+# --- HELPER: Cached ontology lookups ---
+# Streamlit reruns the whole script per widget interaction; without these
+# wrappers every keystroke re-reads the vocabulary cache from the DB.
+@st.cache_data(ttl=60, show_spinner=False)
+def get_cached_sections():
+    """Top-level ontology sections, cached across reruns (60 s TTL)."""
+    return ontology.get_sections()
+
+@st.cache_data(ttl=60, show_spinner=False)
+def get_cached_categories(section):
+    """Categories in an ontology section, cached across reruns (60 s TTL)."""
+    return ontology.get_categories(section)
+
+@st.cache_data(ttl=60, show_spinner=False)
+def get_dashboard_payload():
+    """
+    Record stats + access stats for the Dashboard in one cached fetch.
+
+    Both queries aggregate over whole tables (COUNT/GROUP BY), so don't
+    re-run them on every rerun; 60 s staleness is fine for a dashboard.
     """
-    html_code = f"""
+    return {
+        "stats": database.get_dashboard_stats(),
+        "access": database.get_access_stats(),
+    }
+
+@st.cache_data(ttl=30, show_spinner=False)
+def list_proposals_grouped_cached():
+    """All proposals bucketed by status, one query (30 s TTL) — the three
+    Admin Review tabs all render on every rerun."""
+    return database.list_proposals_grouped()
+
+@st.cache_data(ttl=30, show_spinner=False)
+def count_records_cached():
+    """Total record count for the Saved Records page (30 s TTL)."""
+    return database.count_records()
+
+@st.cache_data(ttl=30, show_spinner=False)
+def list_records_cached(limit, cursor=None):
+    """One page of record summaries for the Saved Records table (30 s TTL).
+
+    cursor is a (created_at, record_id) keyset tuple from the previous page,
+    or None for the newest page — O(limit) at any paging depth.
+    """
+    before, before_id = cursor if cursor else (None, None)
+    return database.list_records(limit=limit, before=before, before_id=before_id)
+
+@st.cache_data(ttl=120, show_spinner=False)
+def get_record_cached(record_id):
+    """Full record JSON for the detail view, cached per id."""
+    return database.get_record(record_id)
+
+@st.cache_data(show_spinner=False)
+def get_api_docs():
+    """Static API reference Markdown, read from disk once per process."""
+    docs_path = os.path.join(os.path.dirname(__file__), "static", "api_docs.md")
+    with open(docs_path) as f:
+        return f.read()
+
+@st.cache_data(ttl=600, max_entries=256, show_spinner=False)
+def _cached_vocab_validate(record_blob: bytes):
+    """Vocabulary validation memoized on canonical record bytes, so
+    revalidating an unchanged upload skips the ontology walk entirely."""
+    return ontology.validate_record_vocabulary(orjson.loads(record_blob))
+
+@st.cache_resource(show_spinner=False)
+def get_schema_validator():
+    """Compiled Draft202012Validator for the ISAAC record schema.
+
+    cache_resource (not cache_data) because the compiled validator isn't
+    serializable; reading and compiling the schema once per process avoids
+    a disk read plus ref/regex compilation on every Validate click.
+    """
+    from jsonschema import Draft202012Validator
+    schema_path = os.path.join(os.path.dirname(__file__), "..", "schema", "isaac_record_v1.json")
+    with open(schema_path) as f:
+        schema = json.load(f)
+    return Draft202012Validator(schema)
+
+# --- HELPER: Mermaid HTML Generator ---
+# Static boilerplate built once; render_mermaid only fills the {code}
+# slot. The CDN URL is version-pinned with crossorigin so the browser
+# caches the loader script across reruns.
+_MERMAID_TEMPLATE = """
     <!DOCTYPE html>
     <html>
     <head>
-        <script src="https://cdn.jsdelivr.net/npm/mermaid/dist/mermaid.min.js"></script>
+        <script src="https://cdn.jsdelivr.net/npm/mermaid@10/dist/mermaid.min.js" crossorigin="anonymous"></script>
         <script>
             mermaid.initialize({{
                 startOnLoad: true,
@@ -167,19 +338,37 @@ def render_mermaid(code, height=600):
     </body>
     </html>
     """
-    components.html(html_code, height=height, scrolling=True)
+
+def render_mermaid(code, height=600):
+    """
+    Renders Mermaid diagram using custom HTML to support Click Events.
+    We need 'securityLevel': 'loose' for clicks to work.
+    """
+    components.html(_MERMAID_TEMPLATE.format(code=code), height=height, scrolling=True)
 
 SECTION_ORDER = [
     "Record Info", "Sample", "Context", "System",
     "Measurement", "Assets", "Links", "Descriptors",
 ]
 
+# One-pass sanitizer for Mermaid node ids (C-level translate instead of
+# chained str.replace calls per node)
+_ID_TRANS = str.maketrans({" ": "_", ".": "_", "/": "_"})
+
+@functools.lru_cache(maxsize=512)
+def _wiki_anchor_url(wiki_page, name):
+    """Wiki page URL with the field/sub-block anchor; names repeat across
+    the tree, so memoize the lowercase/replace/format work."""
+    return f"{WIKI_BASE}/{wiki_page}#{name.lower().replace('_', '-')}"
+
+@st.cache_data(ttl=60, show_spinner=False)
 def generate_mermaid_code(active_section=None, active_category=None):
     """
     Generates Mermaid JS syntax for the ontology tree.
     Includes click events to open Wiki pages in new tab.
+    Cached per (section, category) selection — the ontology changes rarely.
     """
-    all_sections = ontology.get_sections()
+    all_sections = get_cached_sections()
     # Canonical order first, then any extras not in the predefined list
     sections = [s for s in SECTION_ORDER if s in all_sections]
     sections += [s for s in all_sections if s not in SECTION_ORDER]
@@ -201,7 +390,7 @@ def generate_mermaid_code(active_section=None, active_category=None):
 
     for sec in sections:
         disp_sec = get_display_name(sec)
-        sec_id = sec.replace(" ", "_").replace(".", "_")
+        sec_id = sec.translate(_ID_TRANS)
 
         # Node Label
         mm.append(f'Record --> {sec_id}("{disp_sec}")')
@@ -221,7 +410,7 @@ def generate_mermaid_code(active_section=None, active_category=None):
 
         # Drill down if active section
         if is_active_sec:
-            cats = ontology.get_categories(sec)
+            cats = get_cached_categories(sec)
             subblocks = {}
 
             for cat_key in cats:
@@ -244,25 +433,23 @@ def generate_mermaid_code(active_section=None, active_category=None):
                 else:
                     path_parts = path.split('.')
                     sub_name = path_parts[-1]
-                    sub_id = path.replace(".", "_").replace(" ", "_")
+                    sub_id = path.translate(_ID_TRANS)
 
                     mm.append(f"{sec_id} --> {sub_id}({sub_name})")
                     styles.append(f"style {sub_id} fill:{color_subblock}")
                     parent_node = sub_id
 
                     if wiki_page:
-                        anchor = sub_name.lower().replace("_", "-")
-                        sub_url = f"{WIKI_BASE}/{wiki_page}#{anchor}"
+                        sub_url = _wiki_anchor_url(wiki_page, sub_name)
                         click_events.append(f'click {sub_id} "{sub_url}" "Open Section" _blank')
 
                 # Render Fields
                 for field_name, full_key in fields:
-                    field_id = full_key.replace(".", "_").replace(" ", "_")
+                    field_id = full_key.translate(_ID_TRANS)
                     mm.append(f"{parent_node} --> {field_id}[{field_name}]")
 
                     if wiki_page:
-                         anchor = field_name.lower().replace("_", "-")
-                         field_url = f"{WIKI_BASE}/{wiki_page}#{anchor}"
+                         field_url = _wiki_anchor_url(wiki_page, field_name)
                          click_events.append(f'click {field_id} "{field_url}" "Def: {field_name}" _blank')
 
                     if full_key == active_category:
@@ -271,20 +458,18 @@ def generate_mermaid_code(active_section=None, active_category=None):
                         # Show Values
                         vals = cats[full_key]['values'][:5]
                         for val in vals:
-                             val_clean = val.replace(" ", "_").replace("/", "_").replace(".", "_")
+                             val_clean = val.translate(_ID_TRANS)
                              mm.append(f"{field_id} -.-> {val_clean}({val})")
                     else:
                         styles.append(f"style {field_id} fill:{color_field}")
 
-    mm.extend(styles)
-    mm.extend(click_events)
-    return "\n".join(mm)
+    return "\n".join(chain(mm, styles, click_events))
 
 
 # =============================================================================
 # PAGE: Dashboard
 # =============================================================================
-if page == "Dashboard":
+def _page_dashboard():
     st.title("ISAAC AI-Ready Record Portal")
     st.markdown("### The Middleware for Scientific Semantics")
 
@@ -298,8 +483,9 @@ if page == "Dashboard":
         st.info("Database not connected. Configure PGHOST, PGUSER, PGPASSWORD, PGDATABASE environment variables.")
     else:
         try:
-            stats = database.get_dashboard_stats()
-            access = database.get_access_stats()
+            _payload = get_dashboard_payload()
+            stats = _payload["stats"]
+            access = _payload["access"]
 
             # --- Row 1: Status Cards ---
             c1, c2, c3, c4 = st.columns(4)
@@ -351,11 +537,11 @@ if page == "Dashboard":
 # =============================================================================
 # PAGE: Ontology Editor
 # =============================================================================
-elif page == "Ontology Editor":
+def _page_ontology_editor():
     st.header("Living Ontology")
     st.info("Browse the ISAAC vocabulary below. Use the Propose form to suggest changes.")
 
-    all_sections = ontology.get_sections()
+    all_sections = get_cached_sections()
     sections = [s for s in SECTION_ORDER if s in all_sections]
     sections += [s for s in all_sections if s not in SECTION_ORDER]
 
@@ -383,6 +569,11 @@ elif page == "Ontology Editor":
                         with st.spinner("Syncing from wiki..."):
                             ok, msg = ontology.sync_from_wiki(synced_by=current_username)
                         if ok:
+                            # Vocabulary just changed — drop the cached lookups
+                            get_cached_sections.clear()
+                            get_cached_categories.clear()
+                            generate_mermaid_code.clear()
+                            _cached_vocab_validate.clear()
                             st.success(msg)
                             st.rerun()
                         else:
@@ -392,7 +583,7 @@ elif page == "Ontology Editor":
         st.subheader("1. Browse")
         selected_section = st.selectbox("Select Schema Section", sections, format_func=get_display_name)
 
-        categories_dict = ontology.get_categories(selected_section)
+        categories_dict = get_cached_categories(selected_section)
         categories = list(categories_dict.keys())
 
         if categories:
@@ -418,7 +609,7 @@ elif page == "Ontology Editor":
 
         if proposal_type == "Add Term":
             prop_section = st.selectbox("Section", sections, index=sections.index(selected_section) if selected_section in sections else 0, key="prop_sec_term")
-            prop_cats = list(ontology.get_categories(prop_section).keys())
+            prop_cats = list(get_cached_categories(prop_section).keys())
             prop_category = st.selectbox("Category", prop_cats, key="prop_cat_term") if prop_cats else None
             prop_term = st.text_input("New Term", placeholder="e.g. rotating_cylinder", key="prop_term_input")
             prop_term_desc = st.text_area(
@@ -439,6 +630,8 @@ elif page == "Ontology Editor":
                             description=prop_term_desc.strip(),
                             proposed_by=current_username
                         )
+                        get_pending_count.clear()
+                        list_proposals_grouped_cached.clear()
                         st.success(f"Proposal #{pid} submitted! An admin will review it.")
                     except Exception as e:
                         st.error(f"Failed to submit: {e}")
@@ -461,6 +654,8 @@ elif page == "Ontology Editor":
                             description=prop_desc,
                             proposed_by=current_username
                         )
+                        get_pending_count.clear()
+                        list_proposals_grouped_cached.clear()
                         st.success(f"Proposal #{pid} submitted! An admin will review it.")
                     except Exception as e:
                         st.error(f"Failed to submit: {e}")
@@ -498,7 +693,7 @@ elif page == "Ontology Editor":
 # =============================================================================
 # PAGE: Admin Review (admin-only)
 # =============================================================================
-elif page == "Admin Review":
+def _page_admin_review():
     if not user_is_admin:
         st.error("Access denied. Admin privileges required.")
     elif not db_connected:
@@ -508,160 +703,215 @@ elif page == "Admin Review":
 
         tab_pending, tab_approved, tab_rejected = st.tabs(["Pending", "Approved", "Rejected"])
 
+        def _submit_generation(pid, prop, bypass_cache=False):
+            """Kick off an LLM generation for this proposal on the shared pool."""
+            st.session_state[f"gen_fut_{pid}"] = _llm_executor().submit(
+                ontology.generate_wiki_description,
+                section=prop['section'],
+                category=prop.get('category', ''),
+                term=prop.get('term', ''),
+                proposal_type=prop['proposal_type'],
+                user_description=prop.get('description', ''),
+                bypass_cache=bypass_cache
+            )
+
+        @st.fragment
+        def _render_pending_card(prop, current_username):
+            """Body of one pending-proposal card. Button clicks rerun only this
+            fragment, not the whole script; approve/reject escalate to a full
+            rerun so the pending list and nav badge refresh. The bordered
+            container and the bulk-selection checkbox live in the caller (app
+            scope) so toggling a selection reruns the bulk bar too."""
+            pid = prop['id']
+            st.markdown(f"**Proposal #{pid}** — `{prop['proposal_type']}`")
+            st.write(f"**Section:** {prop['section']}")
+            if prop.get('category'):
+                st.write(f"**Category:** {prop['category']}")
+            if prop.get('term'):
+                st.write(f"**Term:** {prop['term']}")
+            if prop.get('description'):
+                st.info(f"**Proposer's description:** {prop['description']}")
+            else:
+                st.warning("No description provided by proposer.")
+            st.caption(f"Proposed by {prop['proposed_by']} on {prop.get('proposed_at_str') or '?'}")
+
+            # A generation submitted from this card may still be in flight:
+            # poll it here so the card keeps rerendering until it resolves,
+            # while the rest of the page (and other cards) stay interactive.
+            drafts = st.session_state.setdefault("proposal_drafts", {})
+
+            fut = st.session_state.get(f"gen_fut_{pid}")
+            if fut is not None:
+                if not fut.done():
+                    st.info("Generating wiki prose with AI...")
+                    time.sleep(0.3)
+                    st.rerun(scope="fragment")
+                else:
+                    del st.session_state[f"gen_fut_{pid}"]
+                    result = fut.result()
+                    if result['success']:
+                        drafts[pid] = {
+                            "reviewing": True,
+                            "prose": result['wiki_prose'],
+                            "yaml_desc": result['yaml_description'],
+                        }
+                    else:
+                        st.error(f"LLM error: {result['error']}")
+
+            is_reviewing = drafts.get(pid, {}).get("reviewing", False)
+
+            if not is_reviewing:
+                # Step 1: Generate draft or quick actions
+                btn_cols = st.columns(3)
+                with btn_cols[0]:
+                    if st.button("Generate Wiki Text", key=f"gen_{pid}", type="primary"):
+                        _submit_generation(pid, prop)
+                        st.rerun(scope="fragment")
+                with btn_cols[1]:
+                    if st.button("Approve (no prose)", key=f"quick_approve_{pid}"):
+                        comment = ""
+                        ok, msg = database.review_proposal(pid, "approved", current_username, comment)
+                        if ok:
+                            get_pending_count.clear()
+                            list_proposals_grouped_cached.clear()
+                            _cached_vocab_validate.clear()
+                            apply_ok, apply_msg, wiki_ok = ontology.apply_approved_proposal(prop)
+                            if apply_ok:
+                                st.success(f"Approved and applied. {apply_msg}")
+                            else:
+                                st.warning(f"Approved but failed to apply: {apply_msg}")
+                            st.rerun()
+                        else:
+                            st.error(msg)
+                with btn_cols[2]:
+                    if st.button("Reject", key=f"reject_{pid}"):
+                        ok, msg = database.review_proposal(pid, "rejected", current_username, "")
+                        if ok:
+                            get_pending_count.clear()
+                            list_proposals_grouped_cached.clear()
+                            st.success("Proposal rejected.")
+                            st.rerun()
+                        else:
+                            st.error(msg)
+            else:
+                # Step 2: Review and edit the generated draft
+                st.divider()
+                st.markdown("**AI-Generated Wiki Text** — edit below before approving:")
+                edited_prose = st.text_area(
+                    "Wiki prose (will be inserted into the wiki page)",
+                    value=drafts.get(pid, {}).get("prose", ""),
+                    height=150,
+                    key=f"prose_{pid}"
+                )
+                edited_yaml_desc = st.text_input(
+                    "YAML description (one-line for the vocabulary block)",
+                    value=drafts.get(pid, {}).get("yaml_desc", ""),
+                    key=f"yaml_desc_{pid}"
+                )
+                review_comment = st.text_input("Review comment (optional)", key=f"comment_{pid}")
+
+                confirm_cols = st.columns(3)
+                with confirm_cols[0]:
+                    if st.button("Approve & Push to Wiki", key=f"confirm_{pid}", type="primary"):
+                        ok, msg = database.review_proposal(pid, "approved", current_username, review_comment)
+                        if ok:
+                            get_pending_count.clear()
+                            list_proposals_grouped_cached.clear()
+                            _cached_vocab_validate.clear()
+                            # Update proposal description with the yaml_desc if provided
+                            enriched_prop = dict(prop)
+                            if edited_yaml_desc:
+                                enriched_prop['_yaml_description'] = edited_yaml_desc
+                            apply_ok, apply_msg, wiki_ok = ontology.apply_approved_proposal(
+                                enriched_prop, wiki_prose=edited_prose
+                            )
+                            if apply_ok:
+                                st.success(f"Approved, applied, and wiki updated. {apply_msg}")
+                                if not wiki_ok:
+                                    st.warning(f"Wiki push issue: {apply_msg}")
+                            else:
+                                st.warning(f"Approved but failed to apply: {apply_msg}")
+                            drafts.pop(pid, None)
+                            st.rerun()
+                        else:
+                            st.error(msg)
+                with confirm_cols[1]:
+                    if st.button("Regenerate", key=f"regen_{pid}"):
+                        _submit_generation(pid, prop, bypass_cache=True)
+                        st.rerun(scope="fragment")
+                with confirm_cols[2]:
+                    if st.button("Cancel", key=f"cancel_{pid}"):
+                        drafts.pop(pid, None)
+                        st.rerun(scope="fragment")
+
         with tab_pending:
-            pending = database.list_proposals(status="pending")
+            pending = list_proposals_grouped_cached()["pending"]
             if not pending:
                 st.info("No pending proposals.")
-
-            # Session state to track which proposal is in the "review draft" step
-            if "reviewing_proposal_id" not in st.session_state:
-                st.session_state.reviewing_proposal_id = None
-            if "draft_wiki_prose" not in st.session_state:
-                st.session_state.draft_wiki_prose = ""
-            if "draft_yaml_desc" not in st.session_state:
-                st.session_state.draft_yaml_desc = ""
+            else:
+                # Bulk controls: one transactional UPDATE for all selected
+                # proposals instead of a click (and rerun) per proposal
+                def _toggle_select_all():
+                    value = st.session_state.sel_all_proposals
+                    for p in pending:
+                        st.session_state[f"sel_{p['id']}"] = value
+
+                bulk_cols = st.columns([1, 2, 3])
+                with bulk_cols[0]:
+                    st.checkbox("Select all", key="sel_all_proposals",
+                                on_change=_toggle_select_all)
+                selected = [p for p in pending if st.session_state.get(f"sel_{p['id']}")]
+                with bulk_cols[1]:
+                    if st.button(f"Approve selected ({len(selected)})",
+                                 disabled=not selected):
+                        updated_ids, msg = database.review_proposals_bulk(
+                            [p['id'] for p in selected], "approved",
+                            current_username, ""
+                        )
+                        get_pending_count.clear()
+                        list_proposals_grouped_cached.clear()
+                        _cached_vocab_validate.clear()
+                        applied, failed = 0, 0
+                        for p in selected:
+                            if p['id'] not in updated_ids:
+                                continue
+                            apply_ok, apply_msg, wiki_ok = ontology.apply_approved_proposal(p)
+                            if apply_ok:
+                                applied += 1
+                            else:
+                                failed += 1
+                        if failed:
+                            st.warning(f"{msg} Applied {applied}, failed to apply {failed}.")
+                        else:
+                            st.success(f"{msg} Applied {applied}.")
+                        st.rerun()
 
             for prop in pending:
                 with st.container(border=True):
-                    pid = prop['id']
-                    st.markdown(f"**Proposal #{pid}** — `{prop['proposal_type']}`")
-                    st.write(f"**Section:** {prop['section']}")
-                    if prop.get('category'):
-                        st.write(f"**Category:** {prop['category']}")
-                    if prop.get('term'):
-                        st.write(f"**Term:** {prop['term']}")
-                    if prop.get('description'):
-                        st.info(f"**Proposer's description:** {prop['description']}")
-                    else:
-                        st.warning("No description provided by proposer.")
-                    st.caption(f"Proposed by {prop['proposed_by']} on {prop['proposed_at'].strftime('%Y-%m-%d %H:%M') if prop.get('proposed_at') else '?'}")
-
-                    is_reviewing = (st.session_state.reviewing_proposal_id == pid)
-
-                    if not is_reviewing:
-                        # Step 1: Generate draft or quick actions
-                        btn_cols = st.columns(3)
-                        with btn_cols[0]:
-                            if st.button("Generate Wiki Text", key=f"gen_{pid}", type="primary"):
-                                with st.spinner("Generating wiki prose with AI..."):
-                                    result = ontology.generate_wiki_description(
-                                        section=prop['section'],
-                                        category=prop.get('category', ''),
-                                        term=prop.get('term', ''),
-                                        proposal_type=prop['proposal_type'],
-                                        user_description=prop.get('description', '')
-                                    )
-                                if result['success']:
-                                    st.session_state.reviewing_proposal_id = pid
-                                    st.session_state.draft_wiki_prose = result['wiki_prose']
-                                    st.session_state.draft_yaml_desc = result['yaml_description']
-                                    st.rerun()
-                                else:
-                                    st.error(f"LLM error: {result['error']}")
-                        with btn_cols[1]:
-                            if st.button("Approve (no prose)", key=f"quick_approve_{pid}"):
-                                comment = ""
-                                ok, msg = database.review_proposal(pid, "approved", current_username, comment)
-                                if ok:
-                                    apply_ok, apply_msg, wiki_ok = ontology.apply_approved_proposal(prop)
-                                    if apply_ok:
-                                        st.success(f"Approved and applied. {apply_msg}")
-                                    else:
-                                        st.warning(f"Approved but failed to apply: {apply_msg}")
-                                    st.rerun()
-                                else:
-                                    st.error(msg)
-                        with btn_cols[2]:
-                            if st.button("Reject", key=f"reject_{pid}"):
-                                ok, msg = database.review_proposal(pid, "rejected", current_username, "")
-                                if ok:
-                                    st.success("Proposal rejected.")
-                                    st.rerun()
-                                else:
-                                    st.error(msg)
-                    else:
-                        # Step 2: Review and edit the generated draft
-                        st.divider()
-                        st.markdown("**AI-Generated Wiki Text** — edit below before approving:")
-                        edited_prose = st.text_area(
-                            "Wiki prose (will be inserted into the wiki page)",
-                            value=st.session_state.draft_wiki_prose,
-                            height=150,
-                            key=f"prose_{pid}"
-                        )
-                        edited_yaml_desc = st.text_input(
-                            "YAML description (one-line for the vocabulary block)",
-                            value=st.session_state.draft_yaml_desc,
-                            key=f"yaml_desc_{pid}"
-                        )
-                        review_comment = st.text_input("Review comment (optional)", key=f"comment_{pid}")
-
-                        confirm_cols = st.columns(3)
-                        with confirm_cols[0]:
-                            if st.button("Approve & Push to Wiki", key=f"confirm_{pid}", type="primary"):
-                                ok, msg = database.review_proposal(pid, "approved", current_username, review_comment)
-                                if ok:
-                                    # Update proposal description with the yaml_desc if provided
-                                    enriched_prop = dict(prop)
-                                    if edited_yaml_desc:
-                                        enriched_prop['_yaml_description'] = edited_yaml_desc
-                                    apply_ok, apply_msg, wiki_ok = ontology.apply_approved_proposal(
-                                        enriched_prop, wiki_prose=edited_prose
-                                    )
-                                    if apply_ok:
-                                        st.success(f"Approved, applied, and wiki updated. {apply_msg}")
-                                        if not wiki_ok:
-                                            st.warning(f"Wiki push issue: {apply_msg}")
-                                    else:
-                                        st.warning(f"Approved but failed to apply: {apply_msg}")
-                                    st.session_state.reviewing_proposal_id = None
-                                    st.session_state.draft_wiki_prose = ""
-                                    st.session_state.draft_yaml_desc = ""
-                                    st.rerun()
-                                else:
-                                    st.error(msg)
-                        with confirm_cols[1]:
-                            if st.button("Regenerate", key=f"regen_{pid}"):
-                                with st.spinner("Regenerating..."):
-                                    result = ontology.generate_wiki_description(
-                                        section=prop['section'],
-                                        category=prop.get('category', ''),
-                                        term=prop.get('term', ''),
-                                        proposal_type=prop['proposal_type'],
-                                        user_description=prop.get('description', '')
-                                    )
-                                if result['success']:
-                                    st.session_state.draft_wiki_prose = result['wiki_prose']
-                                    st.session_state.draft_yaml_desc = result['yaml_description']
-                                    st.rerun()
-                                else:
-                                    st.error(f"LLM error: {result['error']}")
-                        with confirm_cols[2]:
-                            if st.button("Cancel", key=f"cancel_{pid}"):
-                                st.session_state.reviewing_proposal_id = None
-                                st.session_state.draft_wiki_prose = ""
-                                st.session_state.draft_yaml_desc = ""
-                                st.rerun()
+                    # App scope, not the fragment: the bulk bar above reads
+                    # these keys, so a toggle must trigger a full rerun
+                    st.checkbox("Select for bulk approval", key=f"sel_{prop['id']}")
+                    _render_pending_card(prop, current_username)
 
         with tab_approved:
-            approved = database.list_proposals(status="approved")
+            approved = list_proposals_grouped_cached()["approved"]
             if not approved:
                 st.info("No approved proposals.")
             for prop in approved:
                 with st.container(border=True):
                     st.markdown(f"**#{prop['id']}** `{prop['proposal_type']}` — {prop.get('category', '')} {prop.get('term', '') or ''}")
-                    st.caption(f"By {prop['proposed_by']} | Approved by {prop.get('reviewed_by', '?')} on {prop['reviewed_at'].strftime('%Y-%m-%d %H:%M') if prop.get('reviewed_at') else '?'}")
+                    st.caption(f"By {prop['proposed_by']} | Approved by {prop.get('reviewed_by', '?')} on {prop.get('reviewed_at_str') or '?'}")
                     if prop.get('review_comment'):
                         st.write(f"Comment: {prop['review_comment']}")
 
         with tab_rejected:
-            rejected = database.list_proposals(status="rejected")
+            rejected = list_proposals_grouped_cached()["rejected"]
             if not rejected:
                 st.info("No rejected proposals.")
             for prop in rejected:
                 with st.container(border=True):
                     st.markdown(f"**#{prop['id']}** `{prop['proposal_type']}` — {prop.get('category', '')} {prop.get('term', '') or ''}")
-                    st.caption(f"By {prop['proposed_by']} | Rejected by {prop.get('reviewed_by', '?')} on {prop['reviewed_at'].strftime('%Y-%m-%d %H:%M') if prop.get('reviewed_at') else '?'}")
+                    st.caption(f"By {prop['proposed_by']} | Rejected by {prop.get('reviewed_by', '?')} on {prop.get('reviewed_at_str') or '?'}")
                     if prop.get('review_comment'):
                         st.write(f"Comment: {prop['review_comment']}")
 
@@ -669,7 +919,7 @@ elif page == "Admin Review":
 # =============================================================================
 # PAGE: Record Validator
 # =============================================================================
-elif page == "Record Validator":
+def _page_record_validator():
     st.header("Record Validator")
     st.info("Upload an ISAAC JSON record to validate against the schema **and** the living vocabulary.")
 
@@ -678,6 +928,8 @@ elif page == "Record Validator":
         st.session_state.validator_result = None
     if "validator_record" not in st.session_state:
         st.session_state.validator_record = None
+    if "validator_raw" not in st.session_state:
+        st.session_state.validator_raw = None
 
     json_file = st.file_uploader("Upload JSON", type=["json"])
 
@@ -686,36 +938,56 @@ elif page == "Record Validator":
     if current_name != st.session_state.get("validator_filename"):
         st.session_state.validator_result = None
         st.session_state.validator_record = None
+        st.session_state.validator_raw = None
         st.session_state.validator_filename = current_name
 
     if json_file:
         try:
-            raw_text = json_file.read().decode("utf-8")
-            record_data = json.loads(raw_text)
+            raw_bytes = json_file.getvalue()
+            record_data = orjson.loads(raw_bytes)
 
             with st.expander("Record Preview", expanded=False):
-                st.json(record_data)
+                if len(raw_bytes) < 256 * 1024:
+                    st.json(record_data)
+                else:
+                    # Large records: full st.json serializes the whole payload
+                    # to the front-end, so show a truncated pretty-print instead
+                    st.code(orjson.dumps(record_data, option=orjson.OPT_INDENT_2)[:4096].decode() + "\n...")
+                    st.caption("Preview truncated — file larger than 256 KB.")
+
+            show_all_errors = st.toggle(
+                "Show all errors", value=True,
+                help="Off: stop at the first schema error for a fast PASS/FAIL.",
+            )
 
             if st.button("Validate", type="primary"):
-                # Schema validation
-                from jsonschema import Draft202012Validator
-                schema_path = os.path.join(os.path.dirname(__file__), "..", "schema", "isaac_record_v1.json")
-                with open(schema_path) as f:
-                    schema = json.load(f)
-                validator = Draft202012Validator(schema)
-
-                schema_errors = []
-                for err in validator.iter_errors(record_data):
-                    schema_errors.append({
+                validator = get_schema_validator()
+
+                def _check_schema():
+                    if not show_all_errors:
+                        # is_valid() short-circuits on the first failure instead
+                        # of walking the whole record collecting every error
+                        if validator.is_valid(record_data):
+                            return []
+                        return [{
+                            "path": "(quick check)",
+                            "message": "Schema validation failed — turn on 'Show all errors' for details.",
+                        }]
+                    return [{
                         "path": "/".join(str(p) for p in err.absolute_path) or "(root)",
                         "message": err.message,
-                    })
-
-                # Vocabulary validation
-                vocab_errors = ontology.validate_record_vocabulary(record_data)
-
-                # Semantic integrity validation
-                semantic_errors = ontology.validate_semantic_integrity(record_data)
+                    } for err in validator.iter_errors(record_data)]
+
+                # Schema, vocabulary, and integrity checks share no state, and
+                # the ontology checks hit the DB — run all three concurrently
+                record_blob = orjson.dumps(record_data, option=orjson.OPT_SORT_KEYS)
+                with concurrent.futures.ThreadPoolExecutor(max_workers=3) as ex:
+                    fut_schema = ex.submit(_check_schema)
+                    fut_vocab = ex.submit(_cached_vocab_validate, record_blob)
+                    fut_semantic = ex.submit(ontology.validate_semantic_integrity, record_data)
+                    schema_errors = fut_schema.result()
+                    vocab_errors = fut_vocab.result()
+                    semantic_errors = fut_semantic.result()
 
                 # Store results in session state
                 st.session_state.validator_result = {
@@ -724,6 +996,7 @@ elif page == "Record Validator":
                     "semantic_errors": semantic_errors,
                 }
                 st.session_state.validator_record = record_data
+                st.session_state.validator_raw = raw_bytes
 
             # Display results from session state (persists across reruns)
             result = st.session_state.validator_result
@@ -734,29 +1007,27 @@ elif page == "Record Validator":
 
                 col_schema, col_vocab, col_semantic = st.columns(3)
 
+                # One st.dataframe per error list instead of one widget per error
                 with col_schema:
                     if not schema_errors:
                         st.success("Schema: PASS")
                     else:
                         st.error(f"Schema: {len(schema_errors)} error(s)")
-                        for e in schema_errors:
-                            st.write(f"- **{e['path']}**: {e['message']}")
+                        st.dataframe(pd.DataFrame(schema_errors), hide_index=True, width='stretch')
 
                 with col_vocab:
                     if not vocab_errors:
                         st.success("Vocabulary: PASS")
                     else:
                         st.error(f"Vocabulary: {len(vocab_errors)} error(s)")
-                        for e in vocab_errors:
-                            st.write(f"- **{e['path']}**: {e['message']}")
+                        st.dataframe(pd.DataFrame(vocab_errors), hide_index=True, width='stretch')
 
                 with col_semantic:
                     if not semantic_errors:
                         st.success("Integrity: PASS")
                     else:
                         st.error(f"Integrity: {len(semantic_errors)} error(s)")
-                        for e in semantic_errors:
-                            st.write(f"- **{e['path']}**: {e['message']}")
+                        st.dataframe(pd.DataFrame(semantic_errors), hide_index=True, width='stretch')
 
                 if not schema_errors and not vocab_errors and not semantic_errors:
                     st.success("This record is fully compliant with the ISAAC schema and vocabulary!")
@@ -764,7 +1035,13 @@ elif page == "Record Validator":
                     if st.button("Save to Database", key="save_json_btn"):
                         if database.test_db_connection():
                             try:
-                                saved_id = database.save_record(st.session_state.validator_record)
+                                # Ship the original upload bytes so save_record
+                                # doesn't re-serialize the parsed dict
+                                saved_id = database.save_record(
+                                    st.session_state.validator_record,
+                                    raw_json=st.session_state.validator_raw,
+                                )
+                                get_dashboard_payload.clear()
                                 st.success(f"Record saved! ID: `{saved_id}`")
                             except Exception as exc:
                                 st.error(f"Failed to save record: {exc}")
@@ -780,7 +1057,7 @@ elif page == "Record Validator":
 # =============================================================================
 # PAGE: Record Form
 # =============================================================================
-elif page == "Record Form":
+def _page_record_form():
     st.header("Manual Record Entry")
     st.info("Create ISAAC records manually using this form. Navigate to 'Record Form' page for full form.")
 
@@ -796,28 +1073,55 @@ elif page == "Record Form":
 # =============================================================================
 # PAGE: Saved Records
 # =============================================================================
-elif page == "Saved Records":
+def _page_saved_records():
     st.header("Saved Records")
 
     if not db_connected:
         st.warning("Database not connected. Configure PGHOST, PGUSER, PGPASSWORD, PGDATABASE environment variables.")
     else:
+        RECORDS_PAGE_SIZE = 25
+        # Stack of keyset cursors; empty stack = first (newest) page
+        if "records_cursors" not in st.session_state:
+            st.session_state.records_cursors = []
+
         # Refresh button
         if st.button("Refresh"):
+            count_records_cached.clear()
+            list_records_cached.clear()
+            st.session_state.records_cursors = []
             st.rerun()
 
         try:
-            record_count = database.count_records()
+            record_count = count_records_cached()
             st.write(f"Total records: **{record_count}**")
 
             if record_count > 0:
-                records = database.list_records(limit=50)
+                cursors = st.session_state.records_cursors
+                cursor = cursors[-1] if cursors else None
+                records = list_records_cached(limit=RECORDS_PAGE_SIZE, cursor=cursor)
 
                 # Display as table
-                df = pd.DataFrame(records)
-                df.columns = ["Record ID", "Type", "Domain", "Created At"]
+                df = pd.DataFrame(records).rename(columns={
+                    "record_id": "Record ID",
+                    "record_type": "Type",
+                    "record_domain": "Domain",
+                    "created_at": "Created At",
+                })
                 st.dataframe(df, width='stretch')
 
+                nav_prev, nav_info, nav_next = st.columns([1, 3, 1])
+                with nav_prev:
+                    if st.button("Previous", disabled=not cursors):
+                        cursors.pop()
+                        st.rerun()
+                with nav_info:
+                    st.caption(f"Page {len(cursors) + 1} — {record_count} records total")
+                with nav_next:
+                    if st.button("Next", disabled=len(records) < RECORDS_PAGE_SIZE):
+                        last = records[-1]
+                        cursors.append((last['created_at'], last['record_id']))
+                        st.rerun()
+
                 # View record detail
                 st.divider()
                 st.subheader("View Record Detail")
@@ -826,24 +1130,30 @@ elif page == "Saved Records":
                 selected_id = st.selectbox("Select Record", record_ids)
 
                 if selected_id:
-                    record_data = database.get_record(selected_id)
+                    record_data = get_record_cached(selected_id)
                     if record_data:
-                        st.json(record_data)
-
-                        # Download button
-                        json_str = json.dumps(record_data, indent=2)
-                        st.download_button(
-                            label="Download JSON",
-                            data=json_str,
-                            file_name=f"isaac_record_{selected_id}.json",
-                            mime="application/json"
-                        )
+                        # Only serialize the record to the browser when asked —
+                        # selecting a row or paging shouldn't ship the full JSON
+                        with st.expander("Show JSON", expanded=False):
+                            st.json(record_data)
+
+                            # Download button
+                            st.download_button(
+                                label="Download JSON",
+                                data=orjson.dumps(record_data, option=orjson.OPT_INDENT_2),
+                                file_name=f"isaac_record_{selected_id}.json",
+                                mime="application/json"
+                            )
 
                         # Delete button (with confirmation)
                         with st.expander("Danger Zone"):
                             st.warning("This action cannot be undone!")
                             if st.button(f"Delete Record {selected_id}", type="secondary"):
                                 if database.delete_record(selected_id):
+                                    count_records_cached.clear()
+                                    list_records_cached.clear()
+                                    get_record_cached.clear()
+                                    st.session_state.records_cursors = []
                                     st.success("Record deleted.")
                                     st.rerun()
                                 else:
@@ -858,7 +1168,7 @@ elif page == "Saved Records":
 # =============================================================================
 # PAGE: nano ISAAC
 # =============================================================================
-elif page == "nano ISAAC":
+def _page_nano_isaac():
     # Header row with title and Clear button
     title_col, btn_col = st.columns([5, 1])
     with title_col:
@@ -885,48 +1195,60 @@ elif page == "nano ISAAC":
             st.session_state.agent_display = []
             st.rerun()
 
-        # Scrollable chat window (fixed max height)
-        chat_box = st.container(height=480)
-
-        with chat_box:
-            if not st.session_state.agent_display:
-                st.markdown(
-                    "*Ask me anything about the ISAAC database — e.g. "
-                    "\"How many records are there?\" or "
-                    "\"What materials have been measured?\"*"
-                )
-            for msg in st.session_state.agent_display:
-                with st.chat_message(msg["role"]):
-                    st.markdown(msg["content"])
-
-        # Input form directly below the chat box (not pinned to viewport)
-        with st.form("nano_isaac_input", clear_on_submit=True):
-            input_col, send_col = st.columns([6, 1])
-            with input_col:
-                prompt = st.text_input(
-                    "Message", placeholder="Ask about the ISAAC database...",
-                    label_visibility="collapsed",
-                )
-            with send_col:
-                submitted = st.form_submit_button("Send", use_container_width=True)
-
-        if submitted and prompt and prompt.strip():
-            prompt = prompt.strip()
-
-            # Append user message
-            st.session_state.agent_display.append({"role": "user", "content": prompt})
-            st.session_state.agent_messages.append({"role": "user", "content": prompt})
+        # The chat panel is a fragment: sending a message reruns only this
+        # panel (chat box + form + agent call), not the rest of the page.
+        @st.fragment
+        def _render_chat():
+            # Scrollable chat window (fixed max height)
+            chat_box = st.container(height=480)
+
+            with chat_box:
+                if not st.session_state.agent_display:
+                    st.markdown(
+                        "*Ask me anything about the ISAAC database — e.g. "
+                        "\"How many records are there?\" or "
+                        "\"What materials have been measured?\"*"
+                    )
+                for msg in st.session_state.agent_display:
+                    with st.chat_message(msg["role"]):
+                        st.markdown(msg["content"])
+
+            # Input form directly below the chat box (not pinned to viewport)
+            with st.form("nano_isaac_input", clear_on_submit=True):
+                input_col, send_col = st.columns([6, 1])
+                with input_col:
+                    prompt = st.text_input(
+                        "Message", placeholder="Ask about the ISAAC database...",
+                        label_visibility="collapsed",
+                    )
+                with send_col:
+                    submitted = st.form_submit_button("Send", use_container_width=True)
+
+            if submitted and prompt and prompt.strip():
+                prompt = prompt.strip()
+
+                # Append user message
+                st.session_state.agent_display.append({"role": "user", "content": prompt})
+                st.session_state.agent_messages.append({"role": "user", "content": prompt})
+
+                # Echo the message and run the agent inside the chat box so the
+                # user sees their question (and a spinner) while the LLM works
+                with chat_box:
+                    with st.chat_message("user"):
+                        st.markdown(prompt)
+                    with st.chat_message("assistant"):
+                        with st.spinner("Thinking..."):
+                            try:
+                                reply, updated = agent.run_agent_turn(st.session_state.agent_messages)
+                                st.session_state.agent_messages = updated
+                                st.session_state.agent_display.append({"role": "assistant", "content": reply})
+                            except Exception as exc:
+                                err = f"Agent error: {exc}"
+                                st.session_state.agent_display.append({"role": "assistant", "content": err})
 
-            # Run agent and append reply
-            try:
-                reply, updated = agent.run_agent_turn(st.session_state.agent_messages)
-                st.session_state.agent_messages = updated
-                st.session_state.agent_display.append({"role": "assistant", "content": reply})
-            except Exception as exc:
-                err = f"Agent error: {exc}"
-                st.session_state.agent_display.append({"role": "assistant", "content": err})
+                st.rerun(scope="fragment")
 
-            st.rerun()
+        _render_chat()
 
 
 # =============================================================================
@@ -935,7 +1257,7 @@ elif page == "nano ISAAC":
 # =============================================================================
 # PAGE: API Keys
 # =============================================================================
-elif page == "API Keys":
+def _page_api_keys():
     st.header("API Keys")
     st.markdown("Generate and manage API keys for programmatic access to the ISAAC Portal API.")
 
@@ -948,21 +1270,14 @@ elif page == "API Keys":
     if not authentik_api_token:
         st.error("API key management is not configured. Contact an administrator.")
     else:
-        admin_headers = {"Authorization": f"Bearer {authentik_api_token}"}
+        authentik = get_authentik_session(authentik_api_token)
 
-        # Look up current user's PK in Authentik
+        # Look up current user's PK in Authentik (TTL-cached)
         user_pk = None
         try:
-            user_resp = requests.get(
-                f"{authentik_api_url}/api/v3/core/users/",
-                headers=admin_headers,
-                params={"username": current_username},
-                timeout=5,
+            user_pk = lookup_authentik_user_pk(
+                authentik_api_token, authentik_api_url, current_username
             )
-            user_resp.raise_for_status()
-            user_results = user_resp.json().get("results", [])
-            if user_results:
-                user_pk = user_results[0]["pk"]
         except Exception as exc:
             st.error("Could not look up your account. Please try again or contact an administrator.")
 
@@ -977,9 +1292,8 @@ elif page == "API Keys":
                     import ulid
                     identifier = f"isaac-api-{_safe_username}-{str(ulid.ULID()).lower()}"
 
-                    create_resp = requests.post(
+                    create_resp = authentik.post(
                         f"{authentik_api_url}/api/v3/core/tokens/",
-                        headers=admin_headers,
                         json={
                             "identifier": identifier,
                             "intent": "api",
@@ -994,9 +1308,8 @@ elif page == "API Keys":
                         raise ValueError(f"Invalid request: {detail.get('identifier', detail.get('non_field_errors', 'unknown error'))}")
                     create_resp.raise_for_status()
 
-                    key_resp = requests.get(
+                    key_resp = authentik.get(
                         f"{authentik_api_url}/api/v3/core/tokens/{identifier}/view_key/",
-                        headers=admin_headers,
                         timeout=5,
                     )
                     key_resp.raise_for_status()
@@ -1017,9 +1330,8 @@ elif page == "API Keys":
             st.divider()
             st.subheader("Your API Keys")
             try:
-                list_resp = requests.get(
+                list_resp = authentik.get(
                     f"{authentik_api_url}/api/v3/core/tokens/",
-                    headers=admin_headers,
                     params={"user__pk": user_pk, "intent": "api"},
                     timeout=5,
                 )
@@ -1041,13 +1353,14 @@ elif page == "API Keys":
                             st.text(f"{ident}  (created: {created})")
                         with col2:
                             if st.button("Revoke", key=f"revoke_{ident}"):
-                                if not ident.startswith(f"isaac-api-{_safe_username}-"):
+                                if not _API_KEY_IDENT_RE.fullmatch(ident):
+                                    st.error("Invalid key identifier.")
+                                elif not ident.startswith(f"isaac-api-{_safe_username}-"):
                                     st.error("You can only revoke your own keys.")
                                 else:
                                     try:
-                                        del_resp = requests.delete(
+                                        del_resp = authentik.delete(
                                             f"{authentik_api_url}/api/v3/core/tokens/{ident}/",
-                                            headers=admin_headers,
                                             timeout=5,
                                         )
                                         del_resp.raise_for_status()
@@ -1056,179 +1369,28 @@ elif page == "API Keys":
                                     except Exception as exc:
                                         st.error(f"Failed to revoke: {exc}")
             except Exception as exc:
+                # The cached pk may be stale (e.g. user recreated in
+                # Authentik) — drop it so the next rerun re-resolves.
+                lookup_authentik_user_pk.clear()
                 st.error("Failed to list API keys. Please try again or contact an administrator.")
 
 
 # =============================================================================
 # PAGE: API Documentation
 # =============================================================================
-elif page == "API Documentation":
+def _page_api_documentation():
     st.header("API Documentation")
     st.info("The ISAAC Portal includes a REST API sidecar for programmatic record submission and validation.")
 
-    st.subheader("Authentication")
-    st.markdown("""
-    All API endpoints (except health check) require authentication via a **Bearer token**.
-
-    **How to get your token:**
-
-    1. Go to the **API Keys** page in this portal (from the Menu)
-    2. Click **Generate API Key**
-    3. **Copy the key immediately** — it is only shown once
-
-    Then pass it in the `Authorization` header of every API request:
-    """)
-    st.code('Authorization: Bearer <your-token-key>', language="text")
-
-    st.subheader("Base URL")
-    st.code("https://isaac.slac.stanford.edu/portal/api", language="text")
-
-    st.divider()
-
-    # --- Health ---
-    st.subheader("Endpoints")
-
-    st.markdown("#### Health Check")
-    st.code("GET /portal/api/health", language="text")
-    st.markdown("Returns `200` with `{\"status\": \"healthy\"}`. Use for connectivity checks.")
-
-    st.divider()
-
-    # --- Validate ---
-    st.markdown("#### Validate a Record (dry-run)")
-    st.code("POST /portal/api/validate", language="text")
-    st.markdown("""
-    Validates a JSON record against the ISAAC schema **without** saving to the database.
-    Use this to check your data before committing it.
-    """)
-    st.markdown("**Example request:**")
-    st.code('''curl -X POST https://isaac.slac.stanford.edu/portal/api/validate \\
-  -H "Content-Type: application/json" \\
-  -H "Authorization: Bearer <token>" \\
-  -d '{
-    "isaac_record_version": "1.0",
-    "record_id": "01JFH3Q8Z1Q9F0XG3V7N4K2M8C",
-    "record_type": "evidence",
-    "record_domain": "characterization",
-    "source_type": "facility",
-    "timestamps": { "created_utc": "2025-12-14T20:15:00Z" },
-    "sample": {
-      "material": { "name": "Copper(II) Oxide", "formula": "CuO2", "provenance": "commercial" },
-      "sample_form": "pellet"
-    }
-  }' ''', language="bash")
-    st.markdown("**Response fields:**")
-    st.markdown("""
-    | Field | Type | Description |
-    |---|---|---|
-    | `valid` | bool | `true` only if **both** schema and vocabulary pass |
-    | `schema_valid` | bool | JSON Schema validation result |
-    | `vocabulary_valid` | bool | Living-ontology vocabulary check result |
-    | `schema_errors` | list | Schema validation errors |
-    | `vocabulary_errors` | list | Vocabulary validation errors |
-    | `errors` | list | Combined list (schema + vocabulary) for backward compatibility |
-    """)
-    st.markdown("**Responses:**")
-    col1, col2 = st.columns(2)
-    with col1:
-        st.markdown("*Valid:*")
-        st.code('''{ "valid": true,
-  "schema_valid": true,
-  "vocabulary_valid": true,
-  "schema_errors": [],
-  "vocabulary_errors": [],
-  "errors": [] }''', language="json")
-    with col2:
-        st.markdown("*Invalid vocabulary:*")
-        st.code('''{ "valid": false,
-  "schema_valid": true,
-  "vocabulary_valid": false,
-  "schema_errors": [],
-  "vocabulary_errors": [
-    { "path": "system.domain",
-      "message": "'empirical_wrong' is not in the vocabulary..." }
-  ],
-  "errors": [...] }''', language="json")
-
-    st.divider()
-
-    # --- Create Record ---
-    st.markdown("#### Create a Record (validate + write)")
-    st.code("POST /portal/api/records", language="text")
-    st.markdown("""
-    Validates the record against **both** the JSON Schema and the living vocabulary,
-    and **if valid**, persists it to the database.
-    This is the "write-if-valid" endpoint — invalid records are rejected without side effects.
-    """)
-    st.markdown("**Responses:**")
-    col1, col2 = st.columns(2)
-    with col1:
-        st.markdown("*Success (201):*")
-        st.code('{ "success": true, "record_id": "01JFH..." }', language="json")
-    with col2:
-        st.markdown("*Validation failure (400):*")
-        st.code('''{ "success": false,
-  "reason": "validation_failed",
-  "schema_errors": [...],
-  "vocabulary_errors": [...],
-  "errors": [...] }''', language="json")
-
-    st.divider()
-
-    # --- List / Get ---
-    st.markdown("#### List Records")
-    st.code("GET /portal/api/records?limit=100&offset=0", language="text")
-    st.markdown("Returns an array of record summaries (record ID, type, domain, creation timestamp).")
-
-    st.markdown("#### Get a Single Record")
-    st.code("GET /portal/api/records/<record_id>", language="text")
-    st.markdown("Returns the full JSON for a specific record by its ULID.")
-
-    st.divider()
-
-    # --- Python example ---
-    st.subheader("Python Example")
-    st.markdown("List records and fetch a single record using `requests`:")
-    st.code('''import requests
-
-API_URL = "https://isaac.slac.stanford.edu/portal/api"
-TOKEN = "your-api-key-here"
-
-headers = {"Authorization": f"Bearer {TOKEN}"}
-
-# List records (paginated)
-resp = requests.get(f"{API_URL}/records", headers=headers, params={"limit": 10})
-resp.raise_for_status()
-records = resp.json()
-print(f"Found {len(records)} records")
-
-# Fetch a single record by ID
-if records:
-    record_id = records[0]["record_id"]
-    resp = requests.get(f"{API_URL}/records/{record_id}", headers=headers)
-    resp.raise_for_status()
-    record = resp.json()
-    print(f"Record {record_id}: {record['record_type']} / {record['record_domain']}")''', language="python")
-
-    st.divider()
-
-    # --- Simplest curl example ---
-    st.subheader("Simplest Curl Example")
-    st.markdown("Fetch all records with a single `curl` command:")
-    st.code(
-        'curl -H "Authorization: Bearer <token>" \\\n'
-        '  https://isaac.slac.stanford.edu/portal/api/records',
-        language="bash",
-    )
-
-    st.divider()
-    st.markdown(f"**Schema version: ISAAC AI-Ready Record v1.0**")
+    # The whole reference is one static Markdown document: a single st.markdown
+    # call instead of dozens of widgets rebuilt on every visit.
+    st.markdown(get_api_docs())
 
 
 # =============================================================================
 # PAGE: About
 # =============================================================================
-elif page == "About":
+def _page_about():
     st.markdown("""
     Features:
     - **Dashboard**: Database health, record stats, and access metrics at a glance
@@ -1241,6 +1403,29 @@ elif page == "About":
     """)
     st.markdown("**Schema version: ISAAC AI-Ready Record v1.0**")
 
+
+# =============================================================================
+# PAGE DISPATCH
+# =============================================================================
+# Dict lookup instead of a 10-branch if/elif chain; each page body lives in
+# its own function so heavyweight imports (jsonschema, form, ulid) stay lazy.
+_PAGE_RENDERERS = {
+    "Dashboard": _page_dashboard,
+    "Ontology Editor": _page_ontology_editor,
+    "Admin Review": _page_admin_review,
+    "Record Validator": _page_record_validator,
+    "Record Form": _page_record_form,
+    "Saved Records": _page_saved_records,
+    "nano ISAAC": _page_nano_isaac,
+    "API Keys": _page_api_keys,
+    "API Documentation": _page_api_documentation,
+    "About": _page_about,
+}
+
+_render_page = _PAGE_RENDERERS.get(page)
+if _render_page:
+    _render_page()
+
 # =============================================================================
 # FOOTER: Partner & DOE logos on every page
 # =============================================================================
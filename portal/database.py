@@ -3,24 +3,164 @@ ISAAC AI-Ready Record - Database Connection Module
 PostgreSQL connection for vocabulary, templates, and records storage
 """
 
+import csv
+import io
 import os
 import json
 import re
-from datetime import datetime
+import time
+import atexit
+import queue
+import threading
+import weakref
+from contextlib import contextmanager
+from datetime import datetime, timezone
 import psycopg2
-from psycopg2.extras import RealDictCursor
+from psycopg2 import pool as pg_pool
+from psycopg2.extras import RealDictCursor, Json, execute_values, register_default_jsonb
+
+# Decode every JSONB value exactly once, in C, as it comes off the wire.
+# orjson's decoder is several times faster than stdlib json on the record
+# payloads this module shuttles around; fall back to the default if absent.
+# _json_dumps is the matching encoder for outgoing JSONB parameters.
+try:
+    import orjson
+    register_default_jsonb(loads=orjson.loads, globally=True)
+
+    def _json_dumps(obj):
+        return orjson.dumps(obj).decode()
+except ImportError:
+    _json_dumps = json.dumps
+
+# Shared connection pool: every helper in this module opens and closes a
+# "connection" per call, which used to mean a fresh TCP+auth handshake
+# each time — on every request and every Streamlit rerun. The pool keeps
+# the sockets alive; close() just returns the slot.
+_POOL_MIN = int(os.environ.get('PG_POOL_MIN', '2'))
+_POOL_MAX = int(os.environ.get('PG_POOL_MAX', '10'))
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def _get_pool():
+    """Lazily create the shared ThreadedConnectionPool (thread-safe)."""
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = pg_pool.ThreadedConnectionPool(
+                    _POOL_MIN, _POOL_MAX,
+                    host=os.environ.get('PGHOST', 'localhost'),
+                    port=os.environ.get('PGPORT', '5432'),
+                    database=os.environ.get('PGDATABASE', 'app'),
+                    user=os.environ.get('PGUSER', 'postgres'),
+                    password=os.environ.get('PGPASSWORD', ''),
+                    cursor_factory=RealDictCursor
+                )
+    return _pool
+
+
+class _PooledConnection:
+    """
+    Thin proxy over a pooled psycopg2 connection.
+
+    close() returns the connection to the pool instead of tearing down
+    the session, so the per-call connect/close pattern used throughout
+    this module works unchanged while paying the handshake only once per
+    pool slot. putconn() rolls back any transaction the caller left open
+    and discards connections that died mid-use.
+    """
+    __slots__ = ('_conn',)
+
+    def __init__(self, conn):
+        object.__setattr__(self, '_conn', conn)
+
+    def close(self):
+        conn = self._conn
+        if conn is not None:
+            object.__setattr__(self, '_conn', None)
+            _get_pool().putconn(conn, close=conn.closed)
+
+    def __getattr__(self, name):
+        return getattr(self._conn, name)
+
+    def __setattr__(self, name, value):
+        setattr(self._conn, name, value)
+
+
+# Server-side prepared statements for the hottest point lookups: the pool
+# keeps sessions alive, so preparing once per connection turns every later
+# call into EXECUTE with parameter binding only (no parse/plan). Disable
+# with PG_PREPARE_STATEMENTS=0 when running through a transaction-pooling
+# proxy, where session state does not survive between calls.
+_PREPARE_STATEMENTS = os.environ.get('PG_PREPARE_STATEMENTS', '1') == '1'
+_PREPARED_SQL = (
+    'PREPARE isaac_get_record(text) AS '
+    'SELECT data, md5(data::text) AS etag FROM records WHERE record_id = $1',
+    'PREPARE isaac_delete_record(text) AS '
+    'DELETE FROM records WHERE record_id = $1 RETURNING record_id',
+    'PREPARE isaac_get_template(text) AS '
+    'SELECT name, data, created_at, updated_at FROM templates WHERE name = $1',
+    'PREPARE isaac_count_pending AS '
+    "SELECT COUNT(*) AS count FROM vocabulary_proposals WHERE status = 'pending'",
+    'PREPARE isaac_delete_template(text) AS '
+    'DELETE FROM templates WHERE name = $1 RETURNING name',
+    'PREPARE isaac_count_records AS '
+    'SELECT COUNT(*) AS count FROM records',
+)
+_prepared_conns = weakref.WeakSet()
+
+
+def _ensure_prepared(conn):
+    """Run the PREPARE statements once per underlying pooled connection."""
+    if conn in _prepared_conns:
+        return
+    try:
+        cur = conn.cursor()
+        for stmt in _PREPARED_SQL:
+            cur.execute(stmt)
+        conn.commit()
+        cur.close()
+        _prepared_conns.add(conn)
+    except Exception as e:
+        conn.rollback()
+        print(f"Error preparing statements: {e}")
 
 
 def get_db_connection():
-    """Create a database connection using environment variables"""
-    return psycopg2.connect(
-        host=os.environ.get('PGHOST', 'localhost'),
-        port=os.environ.get('PGPORT', '5432'),
-        database=os.environ.get('PGDATABASE', 'app'),
-        user=os.environ.get('PGUSER', 'postgres'),
-        password=os.environ.get('PGPASSWORD', ''),
-        cursor_factory=RealDictCursor
-    )
+    """Check out a database connection from the shared pool"""
+    conn = _get_pool().getconn()
+    if _PREPARE_STATEMENTS:
+        _ensure_prepared(conn)
+    return _PooledConnection(conn)
+
+
+@contextmanager
+def transaction():
+    """
+    Run several writes in one transaction with a single commit.
+
+    Each writer normally commits per call, which costs one WAL fsync per
+    row when looping. Wrapping the loop batches the fsyncs:
+
+        with transaction() as cur:
+            for record in records:
+                save_record(record, cur=cur)
+
+    The cursor commits on clean exit and rolls back on exception. Callers
+    touching records should refresh_record_views() once afterwards.
+    """
+    conn = get_db_connection()
+    cur = conn.cursor()
+    try:
+        yield cur
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        cur.close()
+        conn.close()
 
 
 def is_db_configured():
@@ -28,18 +168,40 @@ def is_db_configured():
     return bool(os.environ.get('PGHOST'))
 
 
+# Readiness probes call test_db_connection() frequently; remember the last
+# successful round-trip so probes within this window skip the DB entirely.
+_HEALTH_CHECK_TTL = 10  # seconds
+_last_db_success = float('-inf')
+
+
 def test_db_connection():
     """Test if database connection is working"""
+    global _last_db_success
     if not is_db_configured():
         return False
+    if time.monotonic() - _last_db_success < _HEALTH_CHECK_TTL:
+        return True
     try:
         conn = get_db_connection()
-        conn.close()
+        try:
+            cur = conn.cursor()
+            cur.execute('SELECT 1')
+            cur.fetchone()
+            cur.close()
+        finally:
+            conn.close()
+        _last_db_success = time.monotonic()
         return True
     except Exception:
         return False
 
 
+# Bump whenever the DDL below changes. Already-migrated databases then
+# fast-path init_tables() with one SELECT instead of replaying ~15 DDL
+# statements (the trigger drop/create touched the catalog on every start).
+SCHEMA_VERSION = 5
+
+
 def init_tables():
     """Initialize database tables if they don't exist"""
     if not is_db_configured():
@@ -49,6 +211,21 @@ def init_tables():
         conn = get_db_connection()
         cur = conn.cursor()
 
+        cur.execute('''
+            CREATE TABLE IF NOT EXISTS schema_migrations (
+                version INT PRIMARY KEY,
+                applied_at TIMESTAMPTZ DEFAULT NOW()
+            )
+        ''')
+        conn.commit()
+
+        cur.execute('SELECT 1 FROM schema_migrations WHERE version = %s',
+                    (SCHEMA_VERSION,))
+        if cur.fetchone():
+            cur.close()
+            conn.close()
+            return True
+
         # Create templates table
         cur.execute('''
             CREATE TABLE IF NOT EXISTS templates (
@@ -60,45 +237,91 @@ def init_tables():
             )
         ''')
 
-        cur.execute('CREATE INDEX IF NOT EXISTS idx_templates_name ON templates(name)')
-
-        # Create updated_at trigger function
-        cur.execute('''
-            CREATE OR REPLACE FUNCTION update_updated_at_column()
-            RETURNS TRIGGER AS $$
-            BEGIN
-                NEW.updated_at = NOW();
-                RETURN NEW;
-            END;
-            $$ LANGUAGE plpgsql
-        ''')
 
-        # Create trigger (drop first to avoid errors)
+        # updated_at used to be stamped by a plpgsql trigger; the only
+        # writer is save_template, which now sets it directly in the UPSERT,
+        # so drop the trigger and its function on already-migrated databases
         cur.execute('DROP TRIGGER IF EXISTS templates_updated_at ON templates')
-        cur.execute('''
-            CREATE TRIGGER templates_updated_at
-                BEFORE UPDATE ON templates
-                FOR EACH ROW
-                EXECUTE FUNCTION update_updated_at_column()
-        ''')
+        cur.execute('DROP FUNCTION IF EXISTS update_updated_at_column()')
 
         # Create records table
         cur.execute('''
             CREATE TABLE IF NOT EXISTS records (
                 id INT GENERATED ALWAYS AS IDENTITY PRIMARY KEY,
-                record_id CHAR(26) UNIQUE NOT NULL,
+                record_id VARCHAR(26) UNIQUE NOT NULL,
                 record_type VARCHAR(50) NOT NULL,
                 record_domain VARCHAR(50) NOT NULL,
                 data JSONB NOT NULL,
-                created_at TIMESTAMPTZ DEFAULT NOW()
+                created_at TIMESTAMPTZ DEFAULT NOW(),
+                updated_at TIMESTAMPTZ DEFAULT NOW()
             )
         ''')
 
-        cur.execute('CREATE INDEX IF NOT EXISTS idx_records_record_id ON records(record_id)')
+        # updated_at backfill for databases created before the column
+        # existed; the upserts stamp it on every content change so the
+        # listing ETag can see updates, not just inserts and deletes
+        cur.execute('''
+            ALTER TABLE records
+            ADD COLUMN IF NOT EXISTS updated_at TIMESTAMPTZ DEFAULT NOW()
+        ''')
+
         cur.execute('CREATE INDEX IF NOT EXISTS idx_records_type ON records(record_type)')
+        # Keeps MAX(updated_at) in get_records_list_state an index probe
+        cur.execute('CREATE INDEX IF NOT EXISTS idx_records_updated ON records (updated_at DESC)')
         cur.execute('CREATE INDEX IF NOT EXISTS idx_records_domain ON records(record_domain)')
-        cur.execute('CREATE INDEX IF NOT EXISTS idx_records_created ON records(created_at)')
-        cur.execute('CREATE INDEX IF NOT EXISTS idx_records_data_gin ON records USING GIN (data)')
+        # Composite B-tree backing the newest-first listing and its keyset
+        # cursor; it also serves the MAX()/range lookups on created_at, so
+        # the single-column B-tree and the interim BRIN index it briefly
+        # replaced are both pure insert-time overhead — drop them
+        cur.execute('''
+            CREATE INDEX IF NOT EXISTS idx_records_created_id
+            ON records (created_at DESC, record_id DESC)
+        ''')
+        cur.execute('DROP INDEX IF EXISTS idx_records_created')
+        cur.execute('DROP INDEX IF EXISTS idx_records_created_brin')
+
+        # The UNIQUE constraints on templates.name and records.record_id
+        # already provide B-tree indexes; drop the redundant duplicates that
+        # earlier versions created alongside them (double write cost per row)
+        cur.execute('DROP INDEX IF EXISTS idx_templates_name')
+        cur.execute('DROP INDEX IF EXISTS idx_records_record_id')
+
+        # record_id was CHAR(26) in earlier deployments: space-padded storage
+        # that forced .strip() on every read. Converge to VARCHAR(26).
+        cur.execute('''
+            ALTER TABLE records
+            ALTER COLUMN record_id TYPE VARCHAR(26) USING rtrim(record_id)
+        ''')
+        # jsonb_path_ops: the only JSONB lookups this schema serves efficiently
+        # are containment (@>), and the path_ops GIN index is roughly half the
+        # size and cheaper to maintain on every save_record write
+        cur.execute('CREATE INDEX IF NOT EXISTS idx_records_data_gin ON records USING GIN (data jsonb_path_ops)')
+
+        # Materialized views for the aggregate query shapes advertised in the
+        # chat agent's SYSTEM_PROMPT examples. Refreshed on record writes so
+        # the common "overview" questions read precomputed rows instead of
+        # rescanning the records heap. The unique indexes are required for
+        # REFRESH ... CONCURRENTLY.
+        cur.execute('''
+            CREATE MATERIALIZED VIEW IF NOT EXISTS mv_record_counts_by_type AS
+                SELECT record_type, COUNT(*) AS count
+                FROM records
+                GROUP BY record_type
+        ''')
+        cur.execute('''
+            CREATE UNIQUE INDEX IF NOT EXISTS idx_mv_counts_type
+            ON mv_record_counts_by_type(record_type)
+        ''')
+        cur.execute('''
+            CREATE MATERIALIZED VIEW IF NOT EXISTS mv_distinct_sample_forms AS
+                SELECT DISTINCT data->'sample'->>'sample_form' AS sample_form
+                FROM records
+                WHERE data->'sample'->>'sample_form' IS NOT NULL
+        ''')
+        cur.execute('''
+            CREATE UNIQUE INDEX IF NOT EXISTS idx_mv_sample_forms
+            ON mv_distinct_sample_forms(sample_form)
+        ''')
 
         # Create portal access log table
         cur.execute('''
@@ -154,25 +377,150 @@ def init_tables():
             )
         ''')
 
+        # Pending rows are the working set and the navbar counts them on every
+        # admin render; a partial index keeps that an index-only scan whose
+        # size tracks the live queue, not the full proposal history.
+        cur.execute('''
+            CREATE INDEX IF NOT EXISTS idx_proposals_pending
+            ON vocabulary_proposals(id) WHERE status = 'pending'
+        ''')
+
+        # Listing filters on status and orders by proposed_at DESC; this
+        # composite index serves that without a seqscan + sort, and the
+        # INCLUDE columns let the summary projection stay index-only.
+        cur.execute('''
+            CREATE INDEX IF NOT EXISTS idx_proposals_status_time
+            ON vocabulary_proposals (status, proposed_at DESC)
+            INCLUDE (id, proposal_type, section, category, term, proposed_by)
+        ''')
+
+        # Cached LLM-generated wiki drafts, keyed on a hash of the proposal
+        # inputs so identical Generate/Regenerate requests skip the LLM call.
+        cur.execute('''
+            CREATE TABLE IF NOT EXISTS wiki_prose_cache (
+                key CHAR(64) PRIMARY KEY,
+                prose TEXT NOT NULL,
+                yaml_desc TEXT NOT NULL DEFAULT '',
+                created_at TIMESTAMPTZ DEFAULT NOW()
+            )
+        ''')
+
+        cur.execute('''
+            INSERT INTO schema_migrations (version) VALUES (%s)
+            ON CONFLICT (version) DO NOTHING
+        ''', (SCHEMA_VERSION,))
         conn.commit()
         cur.close()
         conn.close()
+
+        _migrate_records_gin_index()
         return True
     except Exception as e:
         print(f"Error initializing tables: {e}")
         return False
 
 
+def _migrate_records_gin_index():
+    """One-shot migration of idx_records_data_gin from jsonb_ops to
+    jsonb_path_ops. Rebuilds CONCURRENTLY (needs autocommit) so existing
+    deployments pick up the smaller index without blocking writes."""
+    conn = get_db_connection()
+    cur = conn.cursor()
+    try:
+        cur.execute('''
+            SELECT 1 FROM pg_index i
+            JOIN pg_class c ON c.oid = i.indexrelid
+            JOIN pg_opclass oc ON oc.oid = i.indclass[0]
+            WHERE c.relname = 'idx_records_data_gin'
+              AND oc.opcname = 'jsonb_path_ops'
+        ''')
+        if cur.fetchone():
+            return  # already on jsonb_path_ops
+
+        conn.autocommit = True
+        cur.execute('DROP INDEX CONCURRENTLY IF EXISTS idx_records_data_gin')
+        cur.execute('''
+            CREATE INDEX CONCURRENTLY idx_records_data_gin
+            ON records USING GIN (data jsonb_path_ops)
+        ''')
+    except Exception as e:
+        print(f"Error migrating records GIN index: {e}")
+    finally:
+        conn.autocommit = False
+        cur.close()
+        conn.close()
+
+
 # =============================================================================
 # Record Operations
 # =============================================================================
 
-def save_record(record_data: dict) -> str:
+def refresh_record_views():
+    """
+    Refresh the record materialized views after a write.
+
+    Runs REFRESH ... CONCURRENTLY on an autocommit connection (it cannot
+    run inside a transaction block) so readers are never blocked.
+    Best-effort: a refresh failure must never fail the record write that
+    triggered it.
+    """
+    try:
+        conn = get_db_connection()
+        conn.autocommit = True
+        cur = conn.cursor()
+        try:
+            for view in ('mv_record_counts_by_type', 'mv_distinct_sample_forms'):
+                try:
+                    cur.execute(f'REFRESH MATERIALIZED VIEW CONCURRENTLY {view}')
+                except Exception as e:
+                    print(f"Error refreshing {view}: {e}")
+        finally:
+            cur.close()
+            # Reset session state before the connection goes back to the pool
+            conn.autocommit = False
+            conn.close()
+    except Exception as e:
+        print(f"Error refreshing record views: {e}")
+
+
+# Short-TTL result cache for get_record/count_records, mirroring the
+# template cache further down: records are immutable between explicit
+# writes, so repeated reads of a hot record within the window skip the
+# round trip. Writes invalidate their key; the TTL covers writes made by
+# other portal processes. The record's content hash is cached alongside
+# the payload so conditional GETs never pair a fresh ETag with a stale
+# cached body. The count gets its own slot with a tighter TTL since it
+# drifts with every save.
+_RECORD_CACHE_TTL = 30  # seconds
+_RECORD_CACHE_MAX = 1024
+_record_cache = {}  # record_id -> (record dict, etag, expires_at)
+_record_cache_lock = threading.Lock()
+_COUNT_CACHE_TTL = 5  # seconds
+_count_cache = {}  # exact flag -> (count, expires_at)
+
+
+def _record_cache_invalidate(record_ids=None):
+    """Drop cached records (all of them when record_ids is None) and the count."""
+    with _record_cache_lock:
+        if record_ids is None:
+            _record_cache.clear()
+        else:
+            for record_id in record_ids:
+                _record_cache.pop(record_id, None)
+        _count_cache.clear()
+
+
+def save_record(record_data: dict, raw_json: bytes = None, cur=None) -> str:
     """
     Save an ISAAC record to the database.
 
     Args:
         record_data: The complete ISAAC record as a dictionary
+        raw_json: optional original JSON bytes for the same record; when the
+            caller already holds the serialized form (e.g. an uploaded file),
+            passing it here skips re-serializing the dict
+        cur: optional cursor from transaction(); when given, the caller
+            owns connection and commit (for batching many writes)
 
     Returns:
         The record_id of the saved record
@@ -192,23 +540,196 @@ def save_record(record_data: dict) -> str:
     if not record_domain:
         raise ValueError("record_domain is required")
 
-    conn = get_db_connection()
-    cur = conn.cursor()
+    own_conn = cur is None
+    if own_conn:
+        conn = get_db_connection()
+        cur = conn.cursor()
 
     try:
+        # The WHERE clause makes identical re-saves a no-op: no new row
+        # version, no WAL, no vacuum debt when users resubmit unchanged data
         cur.execute('''
             INSERT INTO records (record_id, record_type, record_domain, data)
             VALUES (%s, %s, %s, %s)
             ON CONFLICT (record_id) DO UPDATE SET
                 record_type = EXCLUDED.record_type,
                 record_domain = EXCLUDED.record_domain,
-                data = EXCLUDED.data
+                data = EXCLUDED.data,
+                updated_at = NOW()
+            WHERE records.data IS DISTINCT FROM EXCLUDED.data
+               OR records.record_type IS DISTINCT FROM EXCLUDED.record_type
+               OR records.record_domain IS DISTINCT FROM EXCLUDED.record_domain
             RETURNING record_id
-        ''', (record_id, record_type, record_domain, json.dumps(record_data)))
+        ''', (record_id, record_type, record_domain,
+              raw_json.decode() if raw_json is not None else Json(record_data, dumps=_json_dumps)))
 
         result = cur.fetchone()
+        if own_conn:
+            conn.commit()
+        if result is None:
+            # Conflict with identical content: nothing was written
+            return record_id
+        _record_cache_invalidate([record_id])
+        if own_conn:
+            refresh_record_views()
+        return result['record_id']
+    finally:
+        if own_conn:
+            cur.close()
+            conn.close()
+
+
+def save_records(records: list) -> list:
+    """
+    Save a batch of ISAAC records in one round trip.
+
+    Callers loading many records should prefer this over looping
+    save_record: execute_values sends a single multi-VALUES upsert instead
+    of one statement per row, and the whole batch commits atomically.
+
+    Args:
+        records: list of complete ISAAC records as dictionaries
+
+    Returns:
+        List of record_ids that were inserted or updated (unchanged
+        re-saves are skipped by the upsert guard and not included)
+
+    Raises:
+        ValueError: If any record is missing a required field
+        Exception: If database operation fails
+    """
+    if not records:
+        return []
+
+    rows = []
+    for record_data in records:
+        record_id = record_data.get('record_id')
+        record_type = record_data.get('record_type')
+        record_domain = record_data.get('record_domain')
+
+        if not record_id:
+            raise ValueError("record_id is required")
+        if not record_type:
+            raise ValueError(f"record_type is required (record {record_id})")
+        if not record_domain:
+            raise ValueError(f"record_domain is required (record {record_id})")
+
+        rows.append((record_id, record_type, record_domain, Json(record_data, dumps=_json_dumps)))
+
+    conn = get_db_connection()
+    cur = conn.cursor()
+
+    try:
+        # Same no-op guard as save_record: identical re-saves write nothing.
+        # fetch=True collects RETURNING rows across all pages.
+        returned = execute_values(cur, '''
+            INSERT INTO records (record_id, record_type, record_domain, data)
+            VALUES %s
+            ON CONFLICT (record_id) DO UPDATE SET
+                record_type = EXCLUDED.record_type,
+                record_domain = EXCLUDED.record_domain,
+                data = EXCLUDED.data,
+                updated_at = NOW()
+            WHERE records.data IS DISTINCT FROM EXCLUDED.data
+               OR records.record_type IS DISTINCT FROM EXCLUDED.record_type
+               OR records.record_domain IS DISTINCT FROM EXCLUDED.record_domain
+            RETURNING record_id
+        ''', rows, page_size=1000, fetch=True)
+        saved = [row['record_id'] for row in returned]
+        conn.commit()
+        if saved:
+            _record_cache_invalidate(saved)
+            refresh_record_views()
+        return saved
+    finally:
+        cur.close()
+        conn.close()
+
+
+def bulk_load_records(records) -> int:
+    """
+    Bulk-load ISAAC records via COPY, for initial imports.
+
+    COPY streams rows without per-row SQL parsing, which beats even the
+    batched save_records once imports reach tens of thousands of records.
+    Rows go through an UNLOGGED staging table and are merged into records
+    with the same upsert semantics as save_record.
+
+    Args:
+        records: iterable of complete ISAAC records as dictionaries
+
+    Returns:
+        Number of records inserted or updated
+
+    Raises:
+        ValueError: If any record is missing a required field
+        Exception: If database operation fails
+    """
+    buf = io.StringIO()
+    writer = csv.writer(buf)
+    total = 0
+    for record_data in records:
+        record_id = record_data.get('record_id')
+        record_type = record_data.get('record_type')
+        record_domain = record_data.get('record_domain')
+
+        if not record_id:
+            raise ValueError("record_id is required")
+        if not record_type:
+            raise ValueError(f"record_type is required (record {record_id})")
+        if not record_domain:
+            raise ValueError(f"record_domain is required (record {record_id})")
+
+        writer.writerow((record_id, record_type, record_domain,
+                         _json_dumps(record_data)))
+        total += 1
+
+    if not total:
+        return 0
+    buf.seek(0)
+
+    conn = get_db_connection()
+    cur = conn.cursor()
+
+    try:
+        # TEMP + ON COMMIT DROP: no WAL for the staging rows, the table
+        # vanishes with the transaction, and the per-session namespace
+        # keeps concurrent loaders from colliding on the name
+        cur.execute('''
+            CREATE TEMP TABLE records_stage (
+                record_id VARCHAR(26),
+                record_type VARCHAR(50),
+                record_domain VARCHAR(50),
+                data JSONB
+            ) ON COMMIT DROP
+        ''')
+        cur.copy_expert(
+            'COPY records_stage (record_id, record_type, record_domain, data) '
+            'FROM STDIN WITH (FORMAT csv)',
+            buf
+        )
+        cur.execute('''
+            INSERT INTO records (record_id, record_type, record_domain, data)
+            SELECT record_id, record_type, record_domain, data
+            FROM records_stage
+            ON CONFLICT (record_id) DO UPDATE SET
+                record_type = EXCLUDED.record_type,
+                record_domain = EXCLUDED.record_domain,
+                data = EXCLUDED.data,
+                updated_at = NOW()
+            WHERE records.data IS DISTINCT FROM EXCLUDED.data
+               OR records.record_type IS DISTINCT FROM EXCLUDED.record_type
+               OR records.record_domain IS DISTINCT FROM EXCLUDED.record_domain
+        ''')
+        loaded = cur.rowcount
         conn.commit()
-        return result['record_id'].strip()
+        if loaded:
+            _record_cache_invalidate()
+            refresh_record_views()
+        return loaded
+    except Exception:
+        conn.rollback()
+        raise
     finally:
         cur.close()
         conn.close()
@@ -224,110 +745,321 @@ def get_record(record_id: str) -> dict:
     Returns:
         The record data as a dictionary, or None if not found
     """
+    return get_record_with_etag(record_id)[0]
+
+
+def get_record_with_etag(record_id: str) -> tuple:
+    """
+    Retrieve a record and its content hash in one lookup.
+
+    The etag is fetched with the payload and cached with it, so the pair
+    is always coherent — conditional GET handlers must use this rather
+    than combining get_record with a separate get_record_etag call, which
+    could pair a fresh hash with a stale cached body.
+
+    Returns:
+        (record dict, etag) or (None, None) if not found
+    """
+    with _record_cache_lock:
+        entry = _record_cache.get(record_id)
+        if entry and entry[2] > time.monotonic():
+            return entry[0], entry[1]
+
     conn = get_db_connection()
     cur = conn.cursor()
 
     try:
-        cur.execute('SELECT data, created_at FROM records WHERE record_id = %s', (record_id,))
+        if _PREPARE_STATEMENTS:
+            cur.execute('EXECUTE isaac_get_record(%s)', (record_id,))
+        else:
+            cur.execute('SELECT data, md5(data::text) AS etag FROM records WHERE record_id = %s',
+                        (record_id,))
         row = cur.fetchone()
 
         if not row:
-            return None
-
-        return row['data']
+            return None, None
+
+        with _record_cache_lock:
+            if len(_record_cache) >= _RECORD_CACHE_MAX:
+                _record_cache.clear()
+            _record_cache[record_id] = (row['data'], row['etag'],
+                                        time.monotonic() + _RECORD_CACHE_TTL)
+        return row['data'], row['etag']
     finally:
         cur.close()
         conn.close()
 
 
-def list_records(limit: int = 100, offset: int = 0) -> list:
+def list_records(limit: int = 100, offset: int = 0, after: str = None,
+                 before=None, before_id: str = None) -> list:
     """
     List all records with pagination.
 
+    Three paging modes:
+    - Keyset, newest-first (preferred for UIs): pass `before`/`before_id`
+      (created_at and record_id of the last row seen) to seek the next page
+      on the (created_at DESC, record_id DESC) composite index — O(limit)
+      at any depth.
+    - Keyset, oldest-first: pass `after` (the record_id of the last row
+      seen) for an index seek on records(record_id). ULIDs sort
+      lexicographically in creation order.
+    - Offset (legacy): `offset` scans and discards that many rows first,
+      which degrades linearly as it grows.
+
     Args:
         limit: Maximum number of records to return
-        offset: Number of records to skip
+        offset: Number of records to skip (ignored when a cursor is given)
+        after: record_id cursor; return records strictly after it
+        before: created_at cursor (datetime or ISO string), paired with before_id
+        before_id: record_id tiebreaker for the `before` cursor
 
     Returns:
         List of record summaries (record_id, record_type, record_domain, created_at)
     """
     conn = get_db_connection()
-    cur = conn.cursor()
+    # Plain tuple rows: the pool default is RealDictCursor, but on a
+    # page-sized result the per-row dict building is pure overhead when
+    # this function shapes its own output dicts anyway
+    cur = conn.cursor(cursor_factory=psycopg2.extensions.cursor)
 
     try:
-        cur.execute('''
-            SELECT record_id, record_type, record_domain, created_at
-            FROM records
-            ORDER BY created_at DESC
-            LIMIT %s OFFSET %s
-        ''', (limit, offset))
+        if before is not None and before_id is not None:
+            cur.execute('''
+                SELECT record_id, record_type, record_domain,
+                       to_char(created_at AT TIME ZONE 'UTC', 'YYYY-MM-DD"T"HH24:MI:SS.US"Z"') AS created_at
+                FROM records
+                WHERE (created_at, record_id) < (%s, %s)
+                ORDER BY created_at DESC, record_id DESC
+                LIMIT %s
+            ''', (before, before_id, limit))
+        elif after is not None:
+            cur.execute('''
+                SELECT record_id, record_type, record_domain,
+                       to_char(created_at AT TIME ZONE 'UTC', 'YYYY-MM-DD"T"HH24:MI:SS.US"Z"') AS created_at
+                FROM records
+                WHERE record_id > %s
+                ORDER BY record_id ASC
+                LIMIT %s
+            ''', (after, limit))
+        else:
+            cur.execute('''
+                SELECT record_id, record_type, record_domain,
+                       to_char(created_at AT TIME ZONE 'UTC', 'YYYY-MM-DD"T"HH24:MI:SS.US"Z"') AS created_at
+                FROM records
+                ORDER BY created_at DESC, record_id DESC
+                LIMIT %s OFFSET %s
+            ''', (limit, offset))
 
-        rows = cur.fetchall()
         return [{
-            'record_id': row['record_id'].strip(),
-            'record_type': row['record_type'],
-            'record_domain': row['record_domain'],
-            'created_at': row['created_at'].isoformat() if row['created_at'] else None
-        } for row in rows]
+            'record_id': record_id,
+            'record_type': record_type,
+            'record_domain': record_domain,
+            'created_at': created_at
+        } for record_id, record_type, record_domain, created_at in cur.fetchall()]
     finally:
         cur.close()
         conn.close()
 
 
-def delete_record(record_id: str) -> bool:
+def delete_record(record_id: str, cur=None) -> bool:
     """
     Delete a record by its ID.
 
     Args:
         record_id: The record identifier to delete
+        cur: optional cursor from transaction(); when given, the caller
+            owns connection and commit
 
     Returns:
         True if deleted, False if not found
     """
-    conn = get_db_connection()
-    cur = conn.cursor()
+    own_conn = cur is None
+    if own_conn:
+        conn = get_db_connection()
+        cur = conn.cursor()
 
     try:
-        cur.execute('DELETE FROM records WHERE record_id = %s RETURNING record_id', (record_id,))
+        if _PREPARE_STATEMENTS:
+            cur.execute('EXECUTE isaac_delete_record(%s)', (record_id,))
+        else:
+            cur.execute('DELETE FROM records WHERE record_id = %s RETURNING record_id', (record_id,))
         deleted = cur.fetchone()
-        conn.commit()
+        if own_conn:
+            conn.commit()
+        if deleted is not None:
+            _record_cache_invalidate([record_id])
+            if own_conn:
+                refresh_record_views()
         return deleted is not None
+    finally:
+        if own_conn:
+            cur.close()
+            conn.close()
+
+
+def get_record_etag(record_id: str) -> str:
+    """
+    Server-side content hash of a record (md5 of its JSONB text).
+
+    Always reads the database; handlers that also serve the body must use
+    get_record_with_etag instead so the hash matches the (possibly
+    cached) payload they return.
+
+    Returns:
+        The hash string, or None if the record does not exist
+    """
+    conn = get_db_connection()
+    cur = conn.cursor()
+
+    try:
+        cur.execute('SELECT md5(data::text) AS etag FROM records WHERE record_id = %s', (record_id,))
+        row = cur.fetchone()
+        return row['etag'] if row else None
     finally:
         cur.close()
         conn.close()
 
 
-def count_records() -> int:
-    """Return the total number of records in the database."""
+def get_records_list_state() -> tuple:
+    """
+    Cheap change marker for the records listing.
+
+    Returns (total, latest_updated_at_iso). The total comes from the
+    mv_record_counts_by_type materialized view (covers deletes) and the
+    max timestamp from the updated_at index (covers inserts and upserts,
+    which stamp updated_at), so neither touches the records heap.
+    """
     conn = get_db_connection()
     cur = conn.cursor()
 
     try:
-        cur.execute('SELECT COUNT(*) as count FROM records')
-        row = cur.fetchone()
-        return row['count']
+        cur.execute('SELECT COALESCE(SUM(count), 0) AS n FROM mv_record_counts_by_type')
+        total = cur.fetchone()['n']
+        cur.execute('SELECT MAX(updated_at) AS latest FROM records')
+        latest = cur.fetchone()['latest']
+        return total, latest.isoformat() if latest else ''
     finally:
         cur.close()
         conn.close()
 
 
-def execute_readonly_query(sql: str, max_rows: int = 50, timeout_ms: int = 5000) -> list:
+def get_record_stats() -> dict:
     """
-    Execute a read-only SQL query against the database.
+    Read the precomputed record aggregates from the materialized views.
+
+    Returns:
+        Dict with 'by_type' ({record_type: count}) and 'sample_forms'
+        (sorted list of distinct sample forms)
+    """
+    conn = get_db_connection()
+    cur = conn.cursor()
+
+    try:
+        cur.execute('SELECT record_type, count FROM mv_record_counts_by_type ORDER BY count DESC')
+        by_type = {row['record_type']: row['count'] for row in cur.fetchall()}
+
+        cur.execute('SELECT sample_form FROM mv_distinct_sample_forms ORDER BY sample_form')
+        sample_forms = [row['sample_form'] for row in cur.fetchall()]
+
+        return {'by_type': by_type, 'sample_forms': sample_forms}
+    finally:
+        cur.close()
+        conn.close()
+
+
+def count_records(exact: bool = False) -> int:
+    """
+    Return the total number of records in the database.
+
+    SELECT COUNT(*) is O(N) under MVCC, so the default path reads the
+    planner's reltuples estimate from pg_class instead — O(1) and close
+    enough for dashboard totals, since autovacuum keeps it fresh. Pass
+    exact=True for a real count; the estimate path also falls back to it
+    when the table has never been analyzed (reltuples = -1).
+
+    Args:
+        exact: run SELECT COUNT(*) instead of the planner estimate
+    """
+    with _record_cache_lock:
+        entry = _count_cache.get(exact)
+        if entry and entry[1] > time.monotonic():
+            return entry[0]
+
+    conn = get_db_connection()
+    cur = conn.cursor()
+
+    try:
+        count = None
+        if not exact:
+            cur.execute(
+                "SELECT reltuples::bigint AS count FROM pg_class WHERE relname = 'records'"
+            )
+            row = cur.fetchone()
+            if row and row['count'] >= 0:
+                count = row['count']
+        if count is None:
+            if _PREPARE_STATEMENTS:
+                cur.execute('EXECUTE isaac_count_records')
+            else:
+                cur.execute('SELECT COUNT(*) as count FROM records')
+            count = cur.fetchone()['count']
+        with _record_cache_lock:
+            _count_cache[exact] = (count, time.monotonic() + _COUNT_CACHE_TTL)
+        return count
+    finally:
+        cur.close()
+        conn.close()
+
+
+# Recognizers for the canonical aggregate shapes from the chat agent's
+# SYSTEM_PROMPT examples. Anchored end-to-end so anything beyond the
+# advertised shape (extra columns, WHERE, LIMIT) runs as written.
+_MV_COUNTS_RE = re.compile(
+    r"^SELECT\s+record_type\s*,\s*COUNT\(\s*\*\s*\)(?:\s+AS\s+(\w+))?\s+"
+    r"FROM\s+records\s+GROUP\s+BY\s+record_type$",
+    re.IGNORECASE,
+)
+_MV_FORMS_RE = re.compile(
+    r"^SELECT\s+DISTINCT\s+data\s*->\s*'sample'\s*->>\s*'sample_form'(?:\s+AS\s+(\w+))?\s+"
+    r"FROM\s+records$",
+    re.IGNORECASE,
+)
+
+
+def _rewrite_to_materialized_view(sql: str) -> str:
+    """
+    Transparently rewrite the advertised aggregate query shapes to their
+    materialized views, preserving any column alias. Returns the SQL
+    unchanged when no shape matches.
+    """
+    m = _MV_COUNTS_RE.match(sql)
+    if m:
+        alias = m.group(1) or 'count'
+        return (
+            f'SELECT record_type, count AS {alias} '
+            'FROM mv_record_counts_by_type ORDER BY count DESC'
+        )
+    m = _MV_FORMS_RE.match(sql)
+    if m:
+        alias = m.group(1) or 'sample_form'
+        return (
+            f'SELECT sample_form AS {alias} '
+            'FROM mv_distinct_sample_forms ORDER BY sample_form'
+        )
+    return sql
+
+
+def _prepare_readonly_sql(sql: str, max_rows: int) -> str:
+    """
+    Validate and normalize a read-only SQL statement.
 
     Security:
     - Only SELECT and WITH (CTE) statements are allowed
     - Mutation keywords (INSERT, UPDATE, DELETE, DROP, ALTER, etc.) are rejected
     - A LIMIT clause is enforced (appended if missing)
-    - A statement timeout is set to prevent long-running queries
-
-    Args:
-        sql: The SQL query string (must be SELECT or WITH)
-        max_rows: Maximum rows to return (default 50)
-        timeout_ms: Statement timeout in milliseconds (default 5000)
 
     Returns:
-        List of row dicts from the query result
+        The normalized SQL string ready for execution
 
     Raises:
         ValueError: If the query is not a safe read-only SELECT/WITH
@@ -344,10 +1076,39 @@ def execute_readonly_query(sql: str, max_rows: int = 50, timeout_ms: int = 5000)
     if re.search(forbidden, upper):
         raise ValueError("Query contains forbidden mutation keywords.")
 
+    # Route the canonical aggregate shapes to their materialized views
+    rewritten = _rewrite_to_materialized_view(stripped)
+    if rewritten != stripped:
+        stripped = rewritten
+        upper = stripped.upper()
+
     # Enforce LIMIT if not present
     if "LIMIT" not in upper:
         stripped += f" LIMIT {max_rows}"
 
+    return stripped
+
+
+def execute_readonly_query(sql: str, max_rows: int = 50, timeout_ms: int = 5000) -> list:
+    """
+    Execute a read-only SQL query against the database.
+
+    See _prepare_readonly_sql for the safety rules. A statement timeout is
+    set to prevent long-running queries.
+
+    Args:
+        sql: The SQL query string (must be SELECT or WITH)
+        max_rows: Maximum rows to return (default 50)
+        timeout_ms: Statement timeout in milliseconds (default 5000)
+
+    Returns:
+        List of row dicts from the query result
+
+    Raises:
+        ValueError: If the query is not a safe read-only SELECT/WITH
+    """
+    stripped = _prepare_readonly_sql(sql, max_rows)
+
     conn = get_db_connection()
     cur = conn.cursor()
 
@@ -361,17 +1122,70 @@ def execute_readonly_query(sql: str, max_rows: int = 50, timeout_ms: int = 5000)
         conn.close()
 
 
+def execute_readonly_queries(sqls: list, max_rows: int = 50, timeout_ms: int = 5000) -> list:
+    """
+    Execute several read-only SQL queries on a single connection.
+
+    Equivalent to calling execute_readonly_query() once per statement, but
+    the whole batch shares one connection so N statements pay one connection
+    setup instead of N. Errors are isolated per statement.
+
+    Args:
+        sqls: List of SQL query strings (each must be SELECT or WITH)
+        max_rows: Maximum rows to return per query (default 50)
+        timeout_ms: Statement timeout in milliseconds per query (default 5000)
+
+    Returns:
+        List with one entry per input query, in order: either a list of row
+        dicts, or the Exception raised for that statement.
+    """
+    results = []
+    conn = get_db_connection()
+    cur = conn.cursor()
+
+    try:
+        for sql in sqls:
+            try:
+                stripped = _prepare_readonly_sql(sql, max_rows)
+                # SET LOCAL per statement: a rollback after a failed block
+                # would silently discard a session-level SET, leaving the
+                # rest of the batch running with no timeout
+                cur.execute(f"SET LOCAL statement_timeout = '{timeout_ms}'")
+                cur.execute(stripped)
+                rows = cur.fetchall()
+                results.append([dict(row) for row in rows])
+            except Exception as exc:
+                # Clear the aborted transaction so later statements can run
+                conn.rollback()
+                results.append(exc)
+        return results
+    finally:
+        cur.close()
+        conn.close()
+
+
 # =============================================================================
 # Template Operations
 # =============================================================================
 
-def save_template(name: str, data: dict) -> str:
+# Templates and the vocabulary cache change rarely (explicit save/sync) but
+# are read on every form render, so keep a short-TTL in-process cache in
+# front of the DB round-trip. Writes invalidate their entry directly; the
+# TTL bounds staleness across portal processes that didn't see the write.
+_TEMPLATE_CACHE_TTL = 30  # seconds
+_template_cache = {}  # name -> (template dict, expires_at)
+_template_cache_lock = threading.Lock()
+
+
+def save_template(name: str, data: dict, cur=None) -> str:
     """
     Save a form template to the database.
 
     Args:
         name: Unique template name
         data: Template data (form field values)
+        cur: optional cursor from transaction(); when given, the caller
+            owns connection and commit
 
     Returns:
         The template name
@@ -381,23 +1195,30 @@ def save_template(name: str, data: dict) -> str:
 
     name = name.strip()
 
-    conn = get_db_connection()
-    cur = conn.cursor()
+    own_conn = cur is None
+    if own_conn:
+        conn = get_db_connection()
+        cur = conn.cursor()
 
     try:
+        # No RETURNING: the caller already has the name, so there is no
+        # result row to materialize and ship back
         cur.execute('''
             INSERT INTO templates (name, data)
             VALUES (%s, %s)
-            ON CONFLICT (name) DO UPDATE SET data = EXCLUDED.data
-            RETURNING name
-        ''', (name, json.dumps(data)))
+            ON CONFLICT (name) DO UPDATE
+                SET data = EXCLUDED.data, updated_at = NOW()
+        ''', (name, Json(data, dumps=_json_dumps)))
 
-        result = cur.fetchone()
-        conn.commit()
-        return result['name']
+        if own_conn:
+            conn.commit()
+        with _template_cache_lock:
+            _template_cache.pop(name, None)
+        return name
     finally:
-        cur.close()
-        conn.close()
+        if own_conn:
+            cur.close()
+            conn.close()
 
 
 def get_template(name: str) -> dict:
@@ -411,25 +1232,36 @@ def get_template(name: str) -> dict:
         Template data dict with 'name', 'data', 'created_at', 'updated_at'
         or None if not found
     """
+    with _template_cache_lock:
+        entry = _template_cache.get(name)
+        if entry and entry[1] > time.monotonic():
+            return entry[0]
+
     conn = get_db_connection()
     cur = conn.cursor()
 
     try:
-        cur.execute(
-            'SELECT name, data, created_at, updated_at FROM templates WHERE name = %s',
-            (name,)
-        )
+        if _PREPARE_STATEMENTS:
+            cur.execute('EXECUTE isaac_get_template(%s)', (name,))
+        else:
+            cur.execute(
+                'SELECT name, data, created_at, updated_at FROM templates WHERE name = %s',
+                (name,)
+            )
         row = cur.fetchone()
 
         if not row:
             return None
 
-        return {
+        template = {
             'name': row['name'],
             'data': row['data'],
             'created_at': row['created_at'].isoformat() if row['created_at'] else None,
             'updated_at': row['updated_at'].isoformat() if row['updated_at'] else None
         }
+        with _template_cache_lock:
+            _template_cache[name] = (template, time.monotonic() + _TEMPLATE_CACHE_TTL)
+        return template
     finally:
         cur.close()
         conn.close()
@@ -446,40 +1278,56 @@ def list_templates() -> list:
     cur = conn.cursor()
 
     try:
-        cur.execute('SELECT name, created_at, updated_at FROM templates ORDER BY name')
+        cur.execute('''
+            SELECT name,
+                   to_char(created_at AT TIME ZONE 'UTC', 'YYYY-MM-DD"T"HH24:MI:SS.US"Z"') AS created_at,
+                   to_char(updated_at AT TIME ZONE 'UTC', 'YYYY-MM-DD"T"HH24:MI:SS.US"Z"') AS updated_at
+            FROM templates ORDER BY name
+        ''')
         rows = cur.fetchall()
 
         return [{
             'name': row['name'],
-            'created_at': row['created_at'].isoformat() if row['created_at'] else None,
-            'updated_at': row['updated_at'].isoformat() if row['updated_at'] else None
+            'created_at': row['created_at'],
+            'updated_at': row['updated_at']
         } for row in rows]
     finally:
         cur.close()
         conn.close()
 
 
-def delete_template(name: str) -> bool:
+def delete_template(name: str, cur=None) -> bool:
     """
     Delete a template by name.
 
     Args:
         name: Template name to delete
+        cur: optional cursor from transaction(); when given, the caller
+            owns connection and commit
 
     Returns:
         True if deleted, False if not found
     """
-    conn = get_db_connection()
-    cur = conn.cursor()
+    own_conn = cur is None
+    if own_conn:
+        conn = get_db_connection()
+        cur = conn.cursor()
 
     try:
-        cur.execute('DELETE FROM templates WHERE name = %s RETURNING name', (name,))
+        if _PREPARE_STATEMENTS:
+            cur.execute('EXECUTE isaac_delete_template(%s)', (name,))
+        else:
+            cur.execute('DELETE FROM templates WHERE name = %s RETURNING name', (name,))
         deleted = cur.fetchone()
-        conn.commit()
+        if own_conn:
+            conn.commit()
+        with _template_cache_lock:
+            _template_cache.pop(name, None)
         return deleted is not None
     finally:
-        cur.close()
-        conn.close()
+        if own_conn:
+            cur.close()
+            conn.close()
 
 
 # =============================================================================
@@ -497,25 +1345,28 @@ def get_dashboard_stats() -> dict:
     cur = conn.cursor()
 
     try:
+        # GROUPING SETS emits the per-type rows and the grand-total row from
+        # one scan instead of two separate queries over the same table
         cur.execute('''
-            SELECT
-                COUNT(*) AS total,
-                MAX(created_at) AS last_indexed
+            SELECT record_type, COUNT(*) AS cnt, MAX(created_at) AS last_indexed
             FROM records
-        ''')
-        row = cur.fetchone()
-
-        cur.execute('''
-            SELECT record_type, COUNT(*) AS cnt
-            FROM records
-            GROUP BY record_type
+            GROUP BY GROUPING SETS ((record_type), ())
             ORDER BY cnt DESC
         ''')
-        by_type = {r['record_type']: r['cnt'] for r in cur.fetchall()}
+
+        total = 0
+        last_indexed = None
+        by_type = {}
+        for row in cur.fetchall():
+            if row['record_type'] is None:
+                total = row['cnt']
+                last_indexed = row['last_indexed']
+            else:
+                by_type[row['record_type']] = row['cnt']
 
         return {
-            'total': row['total'],
-            'last_indexed': row['last_indexed'],
+            'total': total,
+            'last_indexed': last_indexed,
             'by_type': by_type,
         }
     finally:
@@ -523,20 +1374,84 @@ def get_dashboard_stats() -> dict:
         conn.close()
 
 
-def log_access(username: str = "anonymous"):
-    """Insert a row into the portal_access_log table."""
-    conn = get_db_connection()
-    cur = conn.cursor()
+# Access logging is fire-and-forget: log_access enqueues and a single
+# daemon thread batches the INSERTs, so the write never sits on the
+# first render's critical path. Overflow drops entries — it's telemetry.
+_access_q: queue.Queue = queue.Queue(maxsize=10000)
+_access_drainer_started = False
+_access_drainer_lock = threading.Lock()
+_ACCESS_FLUSH_INTERVAL = 1.0  # seconds
+_ACCESS_BATCH_MAX = 500
+
 
+def _drain_access_queue():
+    """Daemon loop: collect queued access rows and batch-insert them."""
+    while True:
+        batch = [_access_q.get()]  # block until there is something to write
+        try:
+            while len(batch) < _ACCESS_BATCH_MAX:
+                batch.append(_access_q.get_nowait())
+        except queue.Empty:
+            pass
+
+        _write_access_batch(batch)
+        time.sleep(_ACCESS_FLUSH_INTERVAL)
+
+
+def _write_access_batch(batch):
+    """Bulk-insert one batch of access rows (single multi-VALUES statement)."""
     try:
-        cur.execute(
-            'INSERT INTO portal_access_log (username) VALUES (%s)',
-            (username,)
-        )
-        conn.commit()
-    finally:
-        cur.close()
-        conn.close()
+        conn = get_db_connection()
+        cur = conn.cursor()
+        try:
+            execute_values(
+                cur,
+                'INSERT INTO portal_access_log (username, accessed_at) VALUES %s',
+                batch
+            )
+            conn.commit()
+        finally:
+            cur.close()
+            conn.close()
+    except Exception as e:
+        print(f"Error writing access log batch: {e}")
+
+
+def _flush_access_queue_at_exit():
+    """Write whatever is still queued when the process shuts down."""
+    batch = []
+    try:
+        while len(batch) < _ACCESS_BATCH_MAX:
+            batch.append(_access_q.get_nowait())
+    except queue.Empty:
+        pass
+    if batch:
+        _write_access_batch(batch)
+
+
+atexit.register(_flush_access_queue_at_exit)
+
+
+def _ensure_access_drainer():
+    """Start the access-log drainer thread once (thread-safe)."""
+    global _access_drainer_started
+    if _access_drainer_started:
+        return
+    with _access_drainer_lock:
+        if not _access_drainer_started:
+            threading.Thread(
+                target=_drain_access_queue, name="access-log-drainer", daemon=True
+            ).start()
+            _access_drainer_started = True
+
+
+def log_access(username: str = "anonymous"):
+    """Queue an access-log row for the background writer (fire-and-forget)."""
+    _ensure_access_drainer()
+    try:
+        _access_q.put_nowait((username, datetime.now(timezone.utc)))
+    except queue.Full:
+        pass
 
 
 def get_access_stats() -> dict:
@@ -570,6 +1485,12 @@ def get_access_stats() -> dict:
 # Vocabulary Cache Operations
 # =============================================================================
 
+# Single-slot TTL cache for the full parsed vocabulary (see the template
+# cache above for rationale); cleared by save_vocabulary_cache.
+_vocab_cache_entry = None  # (vocab dict, expires_at) or None
+_vocab_cache_lock = threading.Lock()
+
+
 def save_vocabulary_cache(vocab: dict, synced_by: str = "system") -> bool:
     """
     Replace all vocabulary cache from parsed wiki data and log the sync.
@@ -587,26 +1508,29 @@ def save_vocabulary_cache(vocab: dict, synced_by: str = "system") -> bool:
     try:
         cur.execute('DELETE FROM vocabulary_cache')
 
-        sections_count = 0
-        categories_count = 0
-
+        # One multi-VALUES INSERT instead of a round-trip per category
+        rows = []
         for section, categories in vocab.items():
-            sections_count += 1
             # Derive wiki_page from section name
             wiki_page = section.replace(" ", "-") if section != "Record Info" else "Record-Overview"
             for category, data in categories.items():
-                categories_count += 1
-                cur.execute('''
-                    INSERT INTO vocabulary_cache (section, category, description, terms, wiki_page)
-                    VALUES (%s, %s, %s, %s, %s)
-                ''', (
+                rows.append((
                     section,
                     category,
                     data.get('description', ''),
-                    json.dumps(data.get('values', [])),
+                    Json(data.get('values', []), dumps=_json_dumps),
                     wiki_page
                 ))
 
+        sections_count = len(vocab)
+        categories_count = len(rows)
+
+        if rows:
+            execute_values(cur, '''
+                INSERT INTO vocabulary_cache (section, category, description, terms, wiki_page)
+                VALUES %s
+            ''', rows, page_size=500)
+
         # Log the sync
         cur.execute('''
             INSERT INTO vocabulary_sync_log (synced_by, sections_count, categories_count, status)
@@ -614,6 +1538,9 @@ def save_vocabulary_cache(vocab: dict, synced_by: str = "system") -> bool:
         ''', (synced_by, sections_count, categories_count))
 
         conn.commit()
+        global _vocab_cache_entry
+        with _vocab_cache_lock:
+            _vocab_cache_entry = None
         return True
     except Exception as e:
         conn.rollback()
@@ -639,32 +1566,91 @@ def load_vocabulary_cache() -> dict:
     Returns:
         dict matching vocabulary.json structure, or empty dict if no cache
     """
+    global _vocab_cache_entry
+    with _vocab_cache_lock:
+        if _vocab_cache_entry and _vocab_cache_entry[1] > time.monotonic():
+            return _vocab_cache_entry[0]
+
     conn = get_db_connection()
-    cur = conn.cursor()
+    # Named (server-side) cursor: streams rows in itersize batches instead of
+    # materializing every section's JSONB terms in driver memory at once
+    cur = conn.cursor(name='vocab_stream')
+    cur.itersize = 200
 
     try:
         cur.execute('SELECT section, category, description, terms FROM vocabulary_cache ORDER BY section, category')
-        rows = cur.fetchall()
-
-        if not rows:
-            return {}
 
         vocab = {}
-        for row in rows:
+        for row in cur:
             section = row['section']
             category = row['category']
             if section not in vocab:
                 vocab[section] = {}
             vocab[section][category] = {
                 'description': row['description'] or '',
-                'values': row['terms'] if isinstance(row['terms'], list) else json.loads(row['terms'])
+                'values': row['terms']
             }
+        with _vocab_cache_lock:
+            _vocab_cache_entry = (vocab, time.monotonic() + _TEMPLATE_CACHE_TTL)
         return vocab
     finally:
         cur.close()
         conn.close()
 
 
+def get_cached_wiki_prose(key: str) -> dict:
+    """
+    Look up a cached LLM-generated wiki draft.
+
+    Args:
+        key: sha256 hex digest of the generation inputs
+
+    Returns:
+        {'prose': str, 'yaml_desc': str} or None on miss/expired entry
+    """
+    conn = get_db_connection()
+    cur = conn.cursor()
+
+    try:
+        cur.execute('''
+            SELECT prose, yaml_desc FROM wiki_prose_cache
+            WHERE key = %s AND created_at > NOW() - INTERVAL '30 days'
+        ''', (key,))
+        row = cur.fetchone()
+        return dict(row) if row else None
+    finally:
+        cur.close()
+        conn.close()
+
+
+def save_cached_wiki_prose(key: str, prose: str, yaml_desc: str) -> bool:
+    """
+    Store an LLM-generated wiki draft, replacing any stale entry for the key.
+    Prunes entries older than the 30-day TTL while it's here.
+    """
+    conn = get_db_connection()
+    cur = conn.cursor()
+
+    try:
+        cur.execute('''
+            INSERT INTO wiki_prose_cache (key, prose, yaml_desc)
+            VALUES (%s, %s, %s)
+            ON CONFLICT (key) DO UPDATE
+                SET prose = EXCLUDED.prose,
+                    yaml_desc = EXCLUDED.yaml_desc,
+                    created_at = NOW()
+        ''', (key, prose, yaml_desc))
+        cur.execute("DELETE FROM wiki_prose_cache WHERE created_at < NOW() - INTERVAL '30 days'")
+        conn.commit()
+        return True
+    except Exception as e:
+        print(f"Error caching wiki prose: {e}")
+        return False
+    finally:
+        cur.close()
+        conn.close()
+
+
 def get_last_sync() -> dict:
     """
     Get the most recent sync log entry.
@@ -729,13 +1715,26 @@ def create_proposal(proposal_type: str, section: str, category: str = None,
         conn.close()
 
 
-def list_proposals(status: str = None, proposed_by: str = None) -> list:
+# Explicit projection shared by the proposal listings: SELECT * would also
+# work today, but naming the columns keeps the wire payload intentional and
+# the to_char display strings (C-level formatting) alongside the raw values.
+_PROPOSAL_COLUMNS = '''id, proposal_type, section, category, term, description,
+                   proposed_by, proposed_at, status, reviewed_by, reviewed_at,
+                   review_comment,
+                   to_char(proposed_at, 'YYYY-MM-DD HH24:MI') AS proposed_at_str,
+                   to_char(reviewed_at, 'YYYY-MM-DD HH24:MI') AS reviewed_at_str'''
+
+
+def list_proposals(status: str = None, proposed_by: str = None,
+                   limit: int = 500, offset: int = 0) -> list:
     """
     List vocabulary proposals with optional filters.
 
     Args:
         status: filter by status ('pending', 'approved', 'rejected') or None for all
         proposed_by: filter by proposer username or None for all
+        limit: maximum rows to return (bounds the payload; default 500)
+        offset: rows to skip
 
     Returns:
         List of proposal dicts
@@ -744,7 +1743,7 @@ def list_proposals(status: str = None, proposed_by: str = None) -> list:
     cur = conn.cursor()
 
     try:
-        query = 'SELECT * FROM vocabulary_proposals WHERE 1=1'
+        query = f'SELECT {_PROPOSAL_COLUMNS} FROM vocabulary_proposals WHERE 1=1'
         params = []
 
         if status:
@@ -754,11 +1753,38 @@ def list_proposals(status: str = None, proposed_by: str = None) -> list:
             query += ' AND proposed_by = %s'
             params.append(proposed_by)
 
-        query += ' ORDER BY proposed_at DESC'
+        query += ' ORDER BY proposed_at DESC LIMIT %s OFFSET %s'
+        params.extend([limit, offset])
         cur.execute(query, params)
 
-        rows = cur.fetchall()
-        return [dict(row) for row in rows]
+        # RealDictCursor rows already behave as dicts — no per-row copy
+        return cur.fetchall()
+    finally:
+        cur.close()
+        conn.close()
+
+
+def list_proposals_grouped() -> dict:
+    """
+    Fetch all proposals in one round-trip, bucketed by status.
+
+    The Admin Review page renders all three status tabs per rerun, so one
+    grouped query replaces three separate list_proposals() calls.
+
+    Returns:
+        {'pending': [...], 'approved': [...], 'rejected': [...]}
+    """
+    conn = get_db_connection()
+    cur = conn.cursor()
+
+    try:
+        cur.execute(f'''SELECT {_PROPOSAL_COLUMNS}
+                        FROM vocabulary_proposals
+                        ORDER BY proposed_at DESC''')
+        grouped = {'pending': [], 'approved': [], 'rejected': []}
+        for row in cur.fetchall():
+            grouped.setdefault(row['status'], []).append(row)
+        return grouped
     finally:
         cur.close()
         conn.close()
@@ -781,23 +1807,63 @@ def review_proposal(proposal_id: int, status: str, reviewed_by: str, comment: st
     cur = conn.cursor()
 
     try:
-        cur.execute('SELECT * FROM vocabulary_proposals WHERE id = %s', (proposal_id,))
-        proposal = cur.fetchone()
+        # Guarded single-statement transition: no separate SELECT round-trip,
+        # and no race window where two reviewers both pass the status check
+        cur.execute('''
+            UPDATE vocabulary_proposals
+            SET status = %s, reviewed_by = %s, reviewed_at = NOW(), review_comment = %s
+            WHERE id = %s AND status = 'pending'
+            RETURNING id
+        ''', (status, reviewed_by, comment, proposal_id))
+        updated = cur.fetchone()
+        conn.commit()
 
-        if not proposal:
+        if updated:
+            return True, f"Proposal {status}."
+
+        # Nothing updated: distinguish missing from already-reviewed
+        cur.execute('SELECT status FROM vocabulary_proposals WHERE id = %s', (proposal_id,))
+        row = cur.fetchone()
+        if not row:
             return False, "Proposal not found."
+        return False, f"Proposal already {row['status']}."
+    finally:
+        cur.close()
+        conn.close()
 
-        if proposal['status'] != 'pending':
-            return False, f"Proposal already {proposal['status']}."
 
+def review_proposals_bulk(ids: list, status: str, reviewed_by: str, comment: str = "") -> tuple:
+    """
+    Approve or reject several proposals in one transaction.
+
+    Only proposals still pending are updated; already-reviewed ones are
+    skipped rather than failing the batch.
+
+    Args:
+        ids: proposal ids to review
+        status: 'approved' or 'rejected'
+        reviewed_by: admin username
+        comment: optional review comment applied to every proposal
+
+    Returns:
+        (updated_ids: list[int], message: str)
+    """
+    if not ids:
+        return [], "No proposals selected."
+
+    conn = get_db_connection()
+    cur = conn.cursor()
+
+    try:
         cur.execute('''
             UPDATE vocabulary_proposals
             SET status = %s, reviewed_by = %s, reviewed_at = NOW(), review_comment = %s
-            WHERE id = %s
-        ''', (status, reviewed_by, comment, proposal_id))
-
+            WHERE id = ANY(%s) AND status = 'pending'
+            RETURNING id
+        ''', (status, reviewed_by, comment, list(ids)))
+        updated = [row['id'] for row in cur.fetchall()]
         conn.commit()
-        return True, f"Proposal {status}."
+        return updated, f"{len(updated)} proposal(s) {status}."
     finally:
         cur.close()
         conn.close()
@@ -809,7 +1875,10 @@ def count_pending_proposals() -> int:
     cur = conn.cursor()
 
     try:
-        cur.execute("SELECT COUNT(*) as count FROM vocabulary_proposals WHERE status = 'pending'")
+        if _PREPARE_STATEMENTS:
+            cur.execute('EXECUTE isaac_count_pending')
+        else:
+            cur.execute("SELECT COUNT(*) as count FROM vocabulary_proposals WHERE status = 'pending'")
         row = cur.fetchone()
         return row['count']
     finally:
@@ -8,11 +8,13 @@ Data flow:
   Fallback: vocabulary_cache → vocabulary.json (file)
 """
 
+import hashlib
 import json
 import os
 import re
 import tempfile
 import shutil
+import time
 
 import yaml
 import git
@@ -26,6 +28,7 @@ try:
     from database import (
         get_db_connection, is_db_configured, test_db_connection,
         save_vocabulary_cache, load_vocabulary_cache, get_last_sync,
+        get_cached_wiki_prose, save_cached_wiki_prose,
     )
     DB_AVAILABLE = True
 except ImportError:
@@ -187,6 +190,7 @@ def sync_from_wiki(synced_by: str = "system") -> tuple:
             return False, "No vocabulary data found in wiki pages"
 
         save_vocabulary_cache(vocab, synced_by)
+        _invalidate_vocab_entries()
 
         msg = f"Synced {parsed_pages} pages, {sum(len(cats) for cats in vocab.values())} categories"
         if skipped_pages:
@@ -241,7 +245,8 @@ def _get_wiki_page_content(section: str) -> str:
 
 def generate_wiki_description(section: str, category: str,
                               term: str = None, proposal_type: str = "add_term",
-                              user_description: str = "") -> dict:
+                              user_description: str = "",
+                              bypass_cache: bool = False) -> dict:
     """
     Use Stanford AI API to generate wiki-style description for a new term or category.
 
@@ -251,6 +256,7 @@ def generate_wiki_description(section: str, category: str,
         term: new term value (for add_term)
         proposal_type: 'add_term' or 'add_category'
         user_description: proposer's plain-language description of the term/category
+        bypass_cache: skip the response cache and force a fresh LLM call
 
     Returns:
         {
@@ -269,6 +275,24 @@ def generate_wiki_description(section: str, category: str,
             'error': 'ISAAC_LLM_API_KEY not configured'
         }
 
+    # Identical inputs produce near-identical drafts, so serve repeats from
+    # the response cache instead of paying another LLM round-trip.
+    cache_key = hashlib.sha256(
+        f"{section}|{category}|{term}|{proposal_type}|{user_description}".encode()
+    ).hexdigest()
+    if DB_AVAILABLE and not bypass_cache:
+        try:
+            cached = get_cached_wiki_prose(cache_key)
+        except Exception:
+            cached = None
+        if cached:
+            return {
+                'yaml_description': cached['yaml_desc'],
+                'wiki_prose': cached['prose'],
+                'success': True,
+                'error': None
+            }
+
     # Get existing wiki page for tone reference
     wiki_content = _get_wiki_page_content(section)
     if not wiki_content:
@@ -356,6 +380,16 @@ Return ONLY valid JSON (no markdown fencing):
         content = re.sub(r'\s*```$', '', content)
         result = json.loads(content)
 
+        if DB_AVAILABLE:
+            try:
+                save_cached_wiki_prose(
+                    cache_key,
+                    result.get('wiki_prose', ''),
+                    result.get('yaml_description', '')
+                )
+            except Exception:
+                pass
+
         return {
             'yaml_description': result.get('yaml_description', ''),
             'wiki_prose': result.get('wiki_prose', ''),
@@ -553,6 +587,7 @@ def apply_approved_proposal(proposal: dict, wiki_prose: str = "") -> tuple:
     if _use_database():
         try:
             save_vocabulary_cache(vocab, proposal.get('reviewed_by', 'system'))
+            _invalidate_vocab_entries()
         except Exception as e:
             return False, f"Failed to update cache: {e}", False
 
@@ -637,6 +672,42 @@ def sync_file_to_db():
 # Category keys that are namespaces (not enum fields in the record)
 _SKIP_CATEGORIES = {"descriptors.theoretical_metric"}
 
+# Flattened vocabulary for the validation hot loop: one entry per
+# enum-bearing category with its pre-split path, a frozenset for O(1)
+# membership tests, and the original list for error messages. Rebuilt on
+# wiki sync (or after a short TTL, for processes that never sync).
+_VOCAB_ENTRIES = None
+_VOCAB_ENTRIES_BUILT = 0.0
+_VOCAB_ENTRIES_TTL = 60  # seconds
+
+
+def _invalidate_vocab_entries():
+    """Drop the flattened vocabulary so the next validation rebuilds it."""
+    global _VOCAB_ENTRIES
+    _VOCAB_ENTRIES = None
+
+
+def _get_vocab_entries():
+    """Return the flattened vocabulary entries, rebuilding if stale."""
+    global _VOCAB_ENTRIES, _VOCAB_ENTRIES_BUILT
+    now = time.monotonic()
+    if _VOCAB_ENTRIES is not None and now - _VOCAB_ENTRIES_BUILT < _VOCAB_ENTRIES_TTL:
+        return _VOCAB_ENTRIES
+
+    entries = []
+    for section_name, categories in load_vocabulary().items():
+        for cat_key, cat_data in categories.items():
+            if cat_key in _SKIP_CATEGORIES:
+                continue
+            allowed = cat_data.get('values', [])
+            if not allowed:
+                continue
+            entries.append((cat_key, cat_key.split("."), frozenset(allowed), allowed))
+
+    _VOCAB_ENTRIES = entries
+    _VOCAB_ENTRIES_BUILT = now
+    return entries
+
 
 def _resolve_path(data, path_parts):
     """
@@ -683,33 +754,22 @@ def validate_record_vocabulary(record):
     Returns a list of error dicts ``[{"path": ..., "message": ...}]``.
     An empty list means all vocabulary terms are valid.
     """
-    vocab = load_vocabulary()
-    if not vocab:
+    entries = _get_vocab_entries()
+    if not entries:
         return []  # No vocabulary loaded — skip validation
 
     errors = []
 
-    for section_name, categories in vocab.items():
-        for cat_key, cat_data in categories.items():
-            if cat_key in _SKIP_CATEGORIES:
-                continue
-
-            allowed = cat_data.get("values", [])
-            if not allowed:
-                continue
-
-            path_parts = cat_key.split(".")
-            hits = _resolve_path(record, path_parts)
-
-            for dotted_path, value in hits:
-                if isinstance(value, str) and value not in allowed:
-                    errors.append({
-                        "path": dotted_path,
-                        "message": (
-                            f"'{value}' is not in the vocabulary for "
-                            f"{cat_key}. Allowed: {allowed}"
-                        ),
-                    })
+    for cat_key, path_parts, allowed_set, allowed in entries:
+        for dotted_path, value in _resolve_path(record, path_parts):
+            if isinstance(value, str) and value not in allowed_set:
+                errors.append({
+                    "path": dotted_path,
+                    "message": (
+                        f"'{value}' is not in the vocabulary for "
+                        f"{cat_key}. Allowed: {allowed}"
+                    ),
+                })
 
     return errors
 
@@ -0,0 +1,123 @@
+"""
+nano ISAAC - Semantic response cache for the chat agent.
+
+Short-circuits the full ReAct loop (up to 3 LLM calls + SQL execution)
+when a researcher asks a question semantically close to one already
+answered recently ("count records by type" vs "how many of each type").
+
+Questions are embedded as hashed bag-of-words vectors and compared by
+cosine similarity — no external model or service required. Entries are
+kept in a bounded LRU with a TTL so stale answers age out as the
+database contents change.
+
+Enable with the ISAAC_SEMANTIC_CACHE=1 environment variable.
+"""
+
+import functools
+import math
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+
+# Dimensionality of the hashed bag-of-words embedding
+_EMBED_DIM = 256
+
+# Similarity threshold for a cache hit (cosine)
+SIMILARITY_THRESHOLD = float(os.environ.get("ISAAC_SEMANTIC_CACHE_THRESHOLD", "0.90"))
+
+MAX_ENTRIES = 1024
+ENTRY_TTL_SECONDS = 3600  # 1 hour
+
+_WORD_RE = re.compile(r"[a-z0-9]+")
+
+# question -> {"embedding": tuple, "answer": str, "expires": float}
+_cache: OrderedDict = OrderedDict()
+_cache_lock = threading.Lock()
+
+
+def is_enabled() -> bool:
+    """Whether the semantic cache is turned on via ISAAC_SEMANTIC_CACHE."""
+    return os.environ.get("ISAAC_SEMANTIC_CACHE", "0") == "1"
+
+
+@functools.lru_cache(maxsize=2048)
+def _embed(text: str) -> tuple:
+    """
+    Embed *text* as an L2-normalised hashed bag-of-words vector.
+
+    Tokens are lowercased alphanumeric runs; each token's count is added
+    to the bucket selected by its hash. Returns a tuple of floats so the
+    result is hashable and safe to share across threads.
+
+    The LRU cache makes repeated embeddings of identical text ("try
+    again", re-asked questions within a session) free.
+    """
+    vec = [0.0] * _EMBED_DIM
+    for token in _WORD_RE.findall(text.lower()):
+        vec[hash(token) % _EMBED_DIM] += 1.0
+
+    norm = math.sqrt(sum(v * v for v in vec))
+    if norm == 0.0:
+        return tuple(vec)
+    return tuple(v / norm for v in vec)
+
+
+def _cosine(a: tuple, b: tuple) -> float:
+    """Cosine similarity of two already-normalised vectors."""
+    return sum(x * y for x, y in zip(a, b))
+
+
+def lookup(question: str):
+    """
+    Return a cached answer for *question* if a semantically similar one
+    exists, else None. Expired entries encountered during the scan are
+    dropped.
+    """
+    if not is_enabled():
+        return None
+
+    query_emb = _embed(question)
+    now = time.monotonic()
+
+    with _cache_lock:
+        expired = [k for k, v in _cache.items() if v["expires"] <= now]
+        for k in expired:
+            del _cache[k]
+
+        best_key = None
+        best_score = 0.0
+        for key, entry in _cache.items():
+            score = _cosine(query_emb, entry["embedding"])
+            if score > best_score:
+                best_score = score
+                best_key = key
+
+        if best_key is not None and best_score >= SIMILARITY_THRESHOLD:
+            _cache.move_to_end(best_key)
+            return _cache[best_key]["answer"]
+
+    return None
+
+
+def store(question: str, answer: str):
+    """Store a (question, answer) pair, evicting LRU entries beyond the cap."""
+    if not is_enabled():
+        return
+
+    with _cache_lock:
+        _cache[question] = {
+            "embedding": _embed(question),
+            "answer": answer,
+            "expires": time.monotonic() + ENTRY_TTL_SECONDS,
+        }
+        _cache.move_to_end(question)
+        while len(_cache) > MAX_ENTRIES:
+            _cache.popitem(last=False)
+
+
+def clear():
+    """Drop all cached answers (e.g. after bulk record imports)."""
+    with _cache_lock:
+        _cache.clear()